@@ -0,0 +1,187 @@
+"""Cache for Data Commons API results
+
+Results fetched from the Data Commons API are held in memory so that places
+are only requested once per session. Optionally, the cache can be persisted to
+a JSON file in a cache directory so results are reused across sessions.
+"""
+
+import json
+import os
+import tempfile
+import time
+from os import PathLike
+from pathlib import Path
+from typing import Optional
+
+from bblocks.places.config import logger
+
+
+class DCCache:
+    """A cache of Data Commons API results
+
+    The cache is organised in sections, for example "dcids" for the results of
+    the resolve endpoint. Each section is a dictionary keyed by the requested value.
+    Results from different Data Commons instances or entity types are kept apart
+    using a namespace, so several resolvers can share the same cache directory.
+
+    The time each entry was added is recorded when the cache is saved, and entries older than
+    `ttl` seconds are discarded, so values that change in Data Commons are fetched again.
+    Each section keeps at most `max_entries` entries. When it grows beyond that, the
+    oldest entries are discarded the next time the cache is saved.
+
+    Parameters:
+        cache_dir: Directory to persist the cache to. If None, the cache is only kept in memory.
+        namespace: Key used to separate the results of different Data Commons instances
+            and entity types stored in the same cache file.
+        max_entries: The maximum number of entries kept in each section.
+        ttl: The number of seconds entries are kept for. Default is one day. If None, entries
+            do not expire.
+    """
+
+    _FILE_NAME = "dc_cache.json"
+
+    def __init__(
+        self,
+        cache_dir: Optional[str | PathLike] = None,
+        namespace: str = "default",
+        max_entries: int = 10_000,
+        ttl: Optional[float] = 86_400,
+    ):
+        self._path = Path(cache_dir) / self._FILE_NAME if cache_dir else None
+        self._namespace = namespace
+        self._max_entries = max_entries
+        self._ttl = ttl
+        self._unsaved = False
+
+        # the values of each section, and the time each value was added
+        stored = self._read().get(namespace, {})
+        self._data: dict[str, dict] = stored.get("values", {})
+        self._times: dict[str, dict[str, float]] = stored.get("times", {})
+        self._discard_old(self._data, self._times)
+
+    def _read(self) -> dict[str, dict]:
+        """Read all the namespaces stored in the cache file"""
+
+        if self._path is None or not self._path.exists():
+            return {}
+
+        try:
+            with open(self._path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.debug(f"Could not read cache file {self._path}. Error: {e}")
+            return {}
+
+    def _write(self, stored: dict[str, dict]) -> bool:
+        """Write all the namespaces to the cache file, returning whether it was written
+
+        The file is written to a temporary file in the same directory first and then moved into
+        place, so other processes never read a partially written file.
+        """
+
+        tmp_path = None
+        try:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=self._path.parent,
+                prefix=f"{self._FILE_NAME}.",
+                suffix=".tmp",
+                delete=False,
+            ) as f:
+                tmp_path = f.name
+                json.dump(stored, f)
+            os.replace(tmp_path, self._path)
+        except OSError as e:
+            logger.warning(f"Could not write cache file {self._path}. Error: {e}")
+            if tmp_path is not None and os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            return False
+
+        return True
+
+    def _discard_old(self, data: dict[str, dict], times: dict[str, dict]) -> None:
+        """Discard expired entries, entries without a time, and the oldest entries of each
+        section beyond the maximum number of entries
+
+        The sections are changed in place, as they may be in use by callers of `section`.
+        """
+
+        cutoff = None if self._ttl is None else time.time() - self._ttl
+
+        for name, section in data.items():
+            section_times = times.get(name, {})
+            keep = [
+                key
+                for key in section
+                if (added := section_times.get(key)) is not None
+                and (cutoff is None or added >= cutoff)
+            ][-self._max_entries :]
+
+            if len(keep) < len(section):
+                kept = {key: section[key] for key in keep}
+                section.clear()
+                section.update(kept)
+            times[name] = {key: section_times[key] for key in section}
+
+    def section(self, name: str) -> dict:
+        """Get a section of the cache, creating it if it doesn't exist
+
+        Args:
+            name: The name of the section.
+
+        Returns:
+            The dictionary holding the cached results for the section. Changes to it are
+            kept in the cache and persisted on the next call to `save`.
+        """
+
+        return self._data.setdefault(name, {})
+
+    def save(self) -> None:
+        """Persist the cache to the cache directory if one is set and there are new entries
+
+        New entries are timed, then expired entries and the oldest entries of sections with more
+        than `max_entries` entries are discarded. Entries saved to the same namespace by other
+        resolvers, including ones in other processes, are kept. Where both have an entry for the
+        same value, the entry of this cache is kept.
+        """
+
+        # time the entries added since the last save
+        now = time.time()
+        for name, section in self._data.items():
+            section_times = self._times.setdefault(name, {})
+            for key in section.keys() - section_times.keys():
+                section_times[key] = now
+                self._unsaved = True
+
+        self._discard_old(self._data, self._times)
+
+        if self._path is None or not self._unsaved:
+            return
+
+        # merge with the entries stored since the cache was read, keeping other namespaces
+        stored = self._read()
+        stored_namespace = stored.get(self._namespace, {})
+        values = stored_namespace.get("values", {})
+        times = stored_namespace.get("times", {})
+        for name, section in self._data.items():
+            values[name] = values.get(name, {}) | section
+            times[name] = times.get(name, {}) | self._times[name]
+        self._discard_old(values, times)
+        stored[self._namespace] = {"values": values, "times": times}
+
+        if self._write(stored):
+            self._unsaved = False
+
+    def clear(self) -> None:
+        """Remove all the cached entries for this namespace, including any persisted ones"""
+
+        self._data.clear()
+        self._times.clear()
+        self._unsaved = False
+
+        if self._path is not None:
+            stored = self._read()
+            stored.pop(self._namespace, None)
+            self._write(stored)
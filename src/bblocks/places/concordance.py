@@ -1,62 +1,385 @@
 """Concordance"""
 
+from collections import OrderedDict
+from itertools import chain
+from typing import Optional
+import weakref
+
+import numpy as np
 import pandas as pd
 from datacommons_client import DataCommonsClient
 
 from bblocks.places.config import logger
-from bblocks.places.utils import clean_string
+from bblocks.places.utils import (
+    clean_string,
+    clean_series,
+    format_values,
+    map_concurrently,
+    split_list,
+)
 
 
-def validate_concordance_table(concordance_table: pd.DataFrame) -> None:
-    """Validate the concordance table to ensure it has
-    - the required column "dcid"
-    - at least one row
-    - at least two columns of which one is "dcid"
-    - no null values in "dcid"
-    - unique values in "dcid"
+def _concordance_table_error(concordance_table: pd.DataFrame) -> Optional[str]:
+    """Get the reason a concordance table is not valid, or None if it is valid
+
+    The checks are run from cheapest to most expensive, and stop at the first failure.
     """
 
     # Check if the concordance table has the required column "dcid"
     if "dcid" not in concordance_table.columns:
-        raise ValueError(f"Concordance table must have a column named 'dcid'")
+        return "Concordance table must have a column named 'dcid'"
 
     if concordance_table.shape[0] == 0:
-        raise ValueError("concordance table must have at least one row")
-
-    if concordance_table["dcid"].isnull().any():
-        raise ValueError("`dcid` column must not contain null values")
-
-    if concordance_table["dcid"].duplicated().any():
-        raise ValueError("`dcid` values must be unique")
+        return "concordance table must have at least one row"
 
     # At least 2 columns are required
     if len(concordance_table.columns) < 2:
-        raise ValueError(f"Concordance table must have at least 2 columns")
+        return "Concordance table must have at least 2 columns"
+
+    # check the dcid values on the underlying array rather than building boolean Series
+    dcids = concordance_table["dcid"].to_numpy(dtype=object)
+
+    if pd.isna(dcids).any():
+        return "`dcid` column must not contain null values"
+
+    if len(set(dcids)) != len(dcids):
+        # list the first few duplicated values, and how many others there are
+        duplicated = pd.unique(dcids[pd.Series(dcids).duplicated().to_numpy()])
+        return (
+            "`dcid` values must be unique. "
+            f"Duplicated values: {format_values(duplicated.tolist())}"
+        )
+
+    return None
+
+
+def is_valid_concordance_table(concordance_table: pd.DataFrame) -> bool:
+    """Check whether a concordance table is valid, without raising an error.
+
+    See `validate_concordance_table` for the conditions a valid table must meet.
+    """
+
+    return _concordance_table_error(concordance_table) is None
+
+
+def validate_concordance_table(concordance_table: pd.DataFrame) -> None:
+    """Validate the concordance table to ensure it has
+    - the required column "dcid"
+    - at least one row
+    - at least two columns of which one is "dcid"
+    - no null values in "dcid"
+    - unique values in "dcid"
+    """
+
+    error = _concordance_table_error(concordance_table)
+    if error is not None:
+        raise ValueError(error)
 
 
 def get_concordance_dict(
-    concordance_table: pd.DataFrame, from_type: str, to_type: str
+    concordance_table: pd.DataFrame,
+    from_type: str,
+    to_type: str,
+    use_cache: bool = False,
 ) -> dict[str, str | int]:
-    """Return a dictionary with the from_type values as keys and the to_type values as values using the concordance table"""
+    """Return a dictionary with the from_type values as keys and the to_type values as values using the concordance table
+
+    If use_cache is True, the dictionary is built once for each concordance table and pair of types
+    and shared by later calls, so the table must not be changed after the first call. The shared
+    dictionary is returned, so it must not be modified.
+    """
+
+    if use_cache:
+        return get_concordance_mappers(concordance_table).get(from_type, to_type)
 
     if from_type == to_type:
         logger.warning(
             "from_type and to_type are the same. Returning identical mapping."
         )
-        return {
-            clean_string(v): v for v in concordance_table[from_type].dropna().unique()
+        values = concordance_table[from_type].dropna().unique()
+        return dict(zip(clean_series(pd.Series(values)), values))
+
+    # pair the columns row by row rather than building an index. Rows without a from_type value
+    # cannot be looked up
+    keys = concordance_table[from_type].to_numpy(dtype=object)
+    values = concordance_table[to_type].to_numpy(dtype=object)
+    mask = pd.notna(keys) & pd.notna(values)
+    return dict(
+        zip(clean_series(pd.Series(keys[mask], dtype=object)), values[mask].tolist())
+    )
+
+
+class ConcordanceMappers:
+    """Cleaned concordance dictionaries for a concordance table, built lazily and reused
+
+    The columns of the table are copied once into arrays, and the cleaned keys of each column are
+    computed once, so building a dictionary for a new pair of types only needs a mask and a zip.
+    The object does not keep a reference to the table itself, so all the dictionaries reflect the
+    table as it was when the object was created.
+
+    Args:
+        concordance_table: The concordance table to build the dictionaries from.
+    """
+
+    # the number of filter results kept by `places`
+    _MAX_CACHED_PLACES = 128
+
+    def __init__(self, concordance_table: pd.DataFrame):
+        # copy the columns, as object columns would otherwise be views of the table
+        self._columns: dict[str, np.ndarray] = {
+            column: concordance_table[column].to_numpy(dtype=object, copy=True)
+            for column in concordance_table.columns
         }
+        self._table_columns = concordance_table.columns
+        self._length = len(concordance_table)
+        self._cleaned: dict[str, np.ndarray] = {}
+        self._mappers: dict[tuple[str, str, bool], dict] = {}
+        self._unique: dict[str, tuple[list, frozenset]] = {}
+        self._raw: dict[tuple[str, str, bool], dict] = {}
+        self._true_keys: dict[tuple[str, str], list] = {}
+        self._factorized: dict[str, tuple[np.ndarray, pd.Index]] = {}
+        self._places: OrderedDict[tuple, list] = OrderedDict()
+        self._positions: dict[str, dict] = {}
+
+    def is_current(self, concordance_table: pd.DataFrame) -> bool:
+        """Check whether a table still has the columns and number of rows the object was built from
+
+        This is a cheap check that catches columns or rows being added or removed in place. Values
+        changed in place are not detected.
+        """
+
+        return (
+            concordance_table.columns is self._table_columns
+            and len(concordance_table) == self._length
+        )
+
+    def column(self, column: str) -> np.ndarray:
+        """Get the values of a column as an object array. The array is shared, so it must not be modified"""
+
+        return self._columns[column]
+
+    def positions(self, column: str) -> dict:
+        """Get a dictionary of the non-null values of a column and the position of their last row
+
+        The dictionary is shared, so it must not be modified.
+        """
+
+        if column not in self._positions:
+            values = self._columns[column]
+            rows = np.flatnonzero(pd.notna(values))
+            self._positions[column] = dict(zip(values[rows].tolist(), rows.tolist()))
+
+        return self._positions[column]
+
+    def _cleaned_keys(self, column: str) -> np.ndarray:
+        """Get the cleaned values of a column, with nulls kept as they are"""
+
+        if column not in self._cleaned:
+            self._cleaned[column] = clean_series(
+                pd.Series(self._columns[column], dtype=object)
+            ).to_numpy()
+
+        return self._cleaned[column]
+
+    def unique_values(self, column: str) -> tuple[list, frozenset]:
+        """Get the unique non-null values of a column, as a list in order of appearance and as a set"""
+
+        if column not in self._unique:
+            values = self._columns[column]
+            unique = pd.unique(values[pd.notna(values)]).tolist()
+            self._unique[column] = (unique, frozenset(unique))
+
+        return self._unique[column]
+
+    def get_raw(
+        self, from_type: str, to_type: str, include_nulls: bool = False
+    ) -> dict:
+        """Return a dictionary with the original (uncleaned) from_type values as keys and the to_type values as values
+
+        Null to_type values are dropped, or kept as None if include_nulls is True. If from_type and
+        to_type are the same, each non-null value maps to itself.
+        """
+
+        key = (from_type, to_type, include_nulls)
+        if key in self._raw:
+            return self._raw[key]
 
-    raw_dict = concordance_table.set_index(from_type)[to_type].dropna().to_dict()
-    return {clean_string(k): v for k, v in raw_dict.items()}
+        if from_type == to_type:
+            mapper = {v: v for v in self.unique_values(from_type)[0]}
+        else:
+            pairs = zip(self._columns[from_type], self._columns[to_type])
+            if include_nulls:
+                mapper = {k: v if pd.notna(v) else None for k, v in pairs}
+            else:
+                # drop null values after building the dictionary, so the last value of a
+                # repeated key is used as it would be without dropping nulls
+                mapper = {k: v for k, v in dict(pairs).items() if pd.notna(v)}
+
+        self._raw[key] = mapper
+        return mapper
+
+    def mask(self, filters: dict[str, list]) -> np.ndarray:
+        """Get a boolean mask of the rows whose values are in the given values for every column
+
+        Each column is factorized once, so the values to match are translated to integer codes
+        and the rows are matched on their codes. Rows with a null value never match.
+
+        Args:
+            filters: A dictionary of column names and the values to match in each column.
+
+        Returns:
+            A boolean array with one value per row of the table.
+        """
+
+        mask = np.ones(self._length, dtype=bool)
+        for column, values in filters.items():
+            if column not in self._factorized:
+                codes, uniques = pd.factorize(self._columns[column])
+                self._factorized[column] = (codes, pd.Index(uniques, dtype=object))
+            codes, uniques = self._factorized[column]
+
+            wanted = uniques.get_indexer(list(values))
+            mask &= np.isin(codes, wanted[wanted != -1])
+
+        return mask
+
+    def places(self, place_format: str, filters: dict[str, tuple]) -> list:
+        """Get the unique non-null place_format values of the rows that match the filters
+
+        The results of the most recent filters are kept, so repeating a query only needs a
+        dictionary lookup. The list is shared, so it must not be modified.
+
+        Args:
+            place_format: The column to return the values of.
+            filters: A dictionary of column names and the values to match in each column.
+
+        Returns:
+            The matching values, in the order of the table.
+        """
+
+        key = (
+            place_format,
+            frozenset(
+                (column, frozenset(values)) for column, values in filters.items()
+            ),
+        )
+        if key in self._places:
+            self._places.move_to_end(key)
+            return self._places[key]
+
+        places = self._columns[place_format][self.mask(filters)]
+        result = pd.unique(places[pd.notna(places)]).tolist()
+
+        self._places[key] = result
+        if len(self._places) > self._MAX_CACHED_PLACES:
+            self._places.popitem(last=False)
+
+        return result
+
+    def true_keys(self, from_type: str, bool_field: str) -> list:
+        """Get the from_type values that map to True in a boolean field
+
+        The values are the keys of `get_raw(from_type, bool_field)` whose value is True.
+        """
+
+        key = (from_type, bool_field)
+        if key not in self._true_keys:
+            self._true_keys[key] = [
+                k for k, v in self.get_raw(from_type, bool_field).items() if v is True
+            ]
+
+        return self._true_keys[key]
+
+    def get(
+        self, from_type: str, to_type: str, include_nulls: bool = False
+    ) -> dict[str, str | int | None]:
+        """Return a dictionary with the cleaned from_type values as keys and the to_type values as values
+
+        This gives the same result as `get_concordance_dict` for the table. If include_nulls is True,
+        rows with a null to_type value are kept and map to None, so every key takes the value of
+        the last row with that key, as it would when mapping through the row's dcid.
+        """
+
+        key = (from_type, to_type, include_nulls)
+        if key in self._mappers:
+            return self._mappers[key]
+
+        if from_type == to_type and not include_nulls:
+            logger.warning(
+                "from_type and to_type are the same. Returning identical mapping."
+            )
+            values = pd.unique(
+                self._columns[from_type][pd.notna(self._columns[from_type])]
+            )
+            mapper = dict(zip(clean_series(pd.Series(values, dtype=object)), values))
+        elif include_nulls:
+            keys = self._cleaned_keys(from_type)
+            values = self._columns[to_type].copy()
+            values[pd.isna(values)] = None
+            mask = pd.notna(keys)
+            mapper = dict(zip(keys[mask], values[mask]))
+        else:
+            keys = self._cleaned_keys(from_type)
+            values = self._columns[to_type]
+            mask = pd.notna(keys) & pd.notna(values)
+            mapper = dict(zip(keys[mask], values[mask]))
+
+        self._mappers[key] = mapper
+        return mapper
+
+
+# Cleaned concordance mappers shared by all callers, keyed by the id of the concordance table
+_SHARED_MAPPERS: dict[int, tuple[weakref.ref, ConcordanceMappers]] = {}
+
+
+def get_concordance_mappers(
+    concordance_table: pd.DataFrame, refresh: bool = False
+) -> ConcordanceMappers:
+    """Get the shared ConcordanceMappers for a concordance table, creating them on first use
+
+    The mappers are kept for as long as the table exists and reflect the table as it was when they
+    were created. They are rebuilt if columns or rows have been added to or removed from the table
+    since, but other changes made to the table in place are only picked up with `refresh`.
+
+    Args:
+        concordance_table: The concordance table to get the mappers for.
+        refresh: Whether to rebuild the mappers from the current contents of the table.
+    """
+
+    table_id = id(concordance_table)
+
+    # the weak reference checks the entry belongs to this table, as ids can be reused
+    # after a table is garbage collected
+    entry = _SHARED_MAPPERS.get(table_id)
+    if (
+        refresh
+        or entry is None
+        or entry[0]() is not concordance_table
+        or not entry[1].is_current(concordance_table)
+    ):
+
+        def _discard(ref: weakref.ref) -> None:
+            # only remove the entry if it has not already been replaced for a new table
+            if _SHARED_MAPPERS.get(table_id, (None,))[0] is ref:
+                del _SHARED_MAPPERS[table_id]
+
+        entry = (
+            weakref.ref(concordance_table, _discard),
+            ConcordanceMappers(concordance_table),
+        )
+        _SHARED_MAPPERS[table_id] = entry
+
+    return entry[1]
 
 
 def _map_single_or_list(val, concordance_dict):
     """Helper function to map a single value or a list of values to their concordance values"""
 
     if isinstance(val, list):
-        mapped = [concordance_dict.get(clean_string(v), None) for v in val]
-        mapped = [m for m in mapped if m is not None]
+        # map the values and drop the ones that are not found in a single pass
+        mapped = [
+            m for v in val if (m := concordance_dict.get(clean_string(v))) is not None
+        ]
         if not mapped:
             return None
         return mapped[0] if len(mapped) == 1 else mapped
@@ -64,36 +387,88 @@ def _map_single_or_list(val, concordance_dict):
         return concordance_dict.get(clean_string(val), None)
 
 
+def _clean_keys(values: list) -> list:
+    """Clean values to look them up in a cleaned concordance dictionary, keeping nulls as None
+
+    The values passed in are unique, so there is nothing to gain from factorizing them first, and
+    cleaning them one by one with the cached `clean_string` avoids building a Series, which takes
+    longer than cleaning hundreds of values.
+    """
+
+    return [None if pd.isna(v) else clean_string(v) for v in values]
+
+
 def map_places(
-    concordance_table: pd.DataFrame, places: list[str | int], from_type, to_type
+    concordance_table: pd.DataFrame,
+    places: list[str | int],
+    from_type,
+    to_type,
+    concordance_dict: Optional[dict] = None,
 ) -> dict[str | int, str | int | None]:
-    """Map a list of places to a desired type using the concordance table"""
+    """Map a list of places to a desired type using the concordance table
 
-    concordance_dict = get_concordance_dict(concordance_table, from_type, to_type)
+    A precomputed concordance dictionary (as returned by `get_concordance_dict`) can be passed
+    to avoid rebuilding it from the concordance table on every call.
+    """
 
-    mapped_series = pd.Series(places, index=places).map(
-        lambda x: _map_single_or_list(x, concordance_dict)
-    )
+    if concordance_dict is None:
+        concordance_dict = get_concordance_dict(concordance_table, from_type, to_type)
 
-    return mapped_series.to_dict()
+    # looking the cleaned places up in the dictionary is quicker than a vectorised
+    # pd.Index.get_indexer join until there are thousands of unique places, far more than a
+    # concordance table holds
+    return dict(zip(places, map(concordance_dict.get, _clean_keys(places))))
 
 
 def map_candidates(
     concordance_table: pd.DataFrame,
     candidates: dict[str, str | list | None],
     to_type: str,
+    concordance_dict: Optional[dict] = None,
 ) -> dict[str, str | list | None]:
-    """Map a dictionary of candidates as dcids to a desired type using the concordance table"""
+    """Map a dictionary of candidates as dcids to a desired type using the concordance table
 
-    concordance_dict = get_concordance_dict(concordance_table, "dcid", to_type)
-    return {
-        place: _map_single_or_list(cands, concordance_dict)
-        for place, cands in candidates.items()
-    }
+    A precomputed concordance dictionary (as returned by `get_concordance_dict`) can be passed
+    to avoid rebuilding it from the concordance table on every call.
+    """
+
+    if concordance_dict is None:
+        concordance_dict = get_concordance_dict(concordance_table, "dcid", to_type)
+
+    # map each unique candidate once
+    unique_candidates = list(
+        dict.fromkeys(
+            chain.from_iterable(
+                cands if isinstance(cands, list) else [cands]
+                for cands in candidates.values()
+                if cands is not None
+            )
+        )
+    )
+    mapped = dict(
+        zip(
+            unique_candidates, map(concordance_dict.get, _clean_keys(unique_candidates))
+        )
+    )
+
+    result = {}
+    for place, cands in candidates.items():
+        if isinstance(cands, list):
+            values = [m for c in cands if (m := mapped.get(c)) is not None]
+            result[place] = values[0] if len(values) == 1 else (values or None)
+        else:
+            result[place] = mapped.get(cands)
+
+    return result
 
 
 def fetch_properties(
-    dc_client: DataCommonsClient, dcids: list[str], dc_property: str
+    dc_client: DataCommonsClient,
+    dcids: list[str],
+    dc_property: str,
+    cache: Optional[dict] = None,
+    chunk_size: Optional[int] = 500,
+    max_workers: Optional[int] = 4,
 ) -> dict[str, str | list[str] | None]:
     """Fetch a property for a list of DCIDs using the Data Commons node endpoint.
 
@@ -101,23 +476,60 @@ def fetch_properties(
         dc_client: An instance of DataCommonsClient.
         dcids: A list of DCIDs to fetch properties for.
         dc_property: The property name to fetch.
+        cache: A dictionary of previously fetched property values keyed by DCID. DCIDs found in the
+            cache are not requested from the API, and newly fetched values are added to it.
+            If None, no caching is done.
+        chunk_size: The number of DCIDs to request at a time. If None, all DCIDs are requested at once.
+        max_workers: The maximum number of chunks to fetch concurrently. If None or 1, chunks are
+            fetched one after the other.
 
     Returns:
         A dictionary mapping each DCID to its property value(s).
     """
 
-    node_response = dc_client.node.fetch_property_values(
-        dcids, dc_property
-    ).get_properties()
     property_map = {}
 
+    # use any cached values and only fetch the dcids that haven't been fetched before
+    if cache is not None:
+        uncached_dcids = []
+        for dcid in dcids:
+            value = cache.get(dcid)
+            if value is not None:
+                # copy lists so the cached values can't be changed by the caller
+                property_map[dcid] = list(value) if isinstance(value, list) else value
+            else:
+                uncached_dcids.append(dcid)
+        dcids = uncached_dcids
+
+        if not dcids:
+            return property_map
+
+    chunks = list(split_list(dcids, chunk_size)) if chunk_size else [dcids]
+
+    # fetch the chunks concurrently and merge the responses in the order of the chunks
+    responses = map_concurrently(
+        lambda chunk: dc_client.node.fetch_property_values(
+            chunk, dc_property
+        ).get_properties(),
+        chunks,
+        max_workers,
+    )
+    node_response = {}
+    for response in responses:
+        node_response.update(response)
+
     for dcid, nodes in node_response.items():
         if isinstance(nodes, list):
-            values = [item.value or item.name or None for item in nodes]
+            # get the value or name of each node, skipping nodes with neither
+            values = [v for item in nodes if (v := item.value or item.name)]
             # Simplify if only one non-null value
-            values = [v for v in values if v is not None]
             property_map[dcid] = values[0] if len(values) == 1 else (values or None)
         else:
             property_map[dcid] = nodes.value or nodes.name or None
 
+        # cache the fetched value. DCIDs without a value are not cached
+        if cache is not None and property_map[dcid] is not None:
+            value = property_map[dcid]
+            cache[dcid] = list(value) if isinstance(value, list) else value
+
     return property_map
@@ -1,18 +1,84 @@
 """Disambiguator"""
 
+import asyncio
+import time
 from datacommons_client import DataCommonsClient
 from datacommons_client.utils.error_handling import DCStatusError
 from typing import Optional
+import pandas as pd
 
-from bblocks.places.utils import clean_string, split_list
+from bblocks.places.utils import (
+    clean_string,
+    clean_series,
+    map_concurrently,
+    split_list,
+)
 from bblocks.places.config import logger
 
 
+# HTTP status codes of errors that are likely to pass if the request is made again, and how
+# many times, and after how long, such requests are retried. The delay doubles with each retry
+_RETRY_STATUS_CODES = frozenset({429, 500, 502, 503, 504})
+_MAX_RETRIES = 2
+_RETRY_BACKOFF = 0.5  # seconds
+
+
+def _fetch_with_retries(
+    dc_client: DataCommonsClient, entities: str | list, entity_type: str
+) -> dict[str, str | list | None]:
+    """Fetch DCIDs from the resolve endpoint, retrying requests that fail with a transient error.
+
+    Raises:
+        DCStatusError if the request fails with an error that is not transient, or still fails
+            after the retries.
+    """
+
+    for attempt in range(_MAX_RETRIES + 1):
+        try:
+            return dc_client.resolve.fetch_dcids_by_name(
+                entities, entity_type
+            ).to_flat_dict()
+        except DCStatusError as e:
+            status = getattr(getattr(e, "response", None), "status_code", None)
+            if status not in _RETRY_STATUS_CODES or attempt == _MAX_RETRIES:
+                raise
+            delay = _RETRY_BACKOFF * 2**attempt
+            logger.debug(f"Data Commons returned status {status}. Retrying in {delay}s")
+            time.sleep(delay)
+
+
+def _fetch_entity(
+    dc_client: DataCommonsClient, entity: str, entity_type: str
+) -> dict[str, str | list | None]:
+    """Fetch DCIDs for a single entity, mapping it to None if it cannot be resolved."""
+
+    try:
+        return _fetch_with_retries(dc_client, entity, entity_type)
+    except Exception as e:
+        logger.debug(f"Error fetching DCID for {entity}. Resolving to None. Error: {e}")
+        return {entity: None}
+
+
+def _fetch_chunk(
+    dc_client: DataCommonsClient, entities: list, entity_type: str
+) -> dict[str, str | list | None] | None:
+    """Fetch DCIDs for a single request worth of entities, or None if the request fails."""
+
+    try:
+        return _fetch_with_retries(dc_client, entities, entity_type)
+    except DCStatusError as e:
+        logger.debug(
+            f"Error fetching DCIDs for entities {entities} of type {entity_type}: {e}"
+        )
+        return None
+
+
 def fetch_dcids_by_name(
     dc_client: DataCommonsClient,
     entities: str | list,
     entity_type: str,
     chunk_size: Optional[int] = 30,
+    max_workers: Optional[int] = 4,
 ) -> dict[str, str | list | None]:
     """Fetch DCIDs for a list of entities using the DataCommonsClient.
 
@@ -21,6 +87,10 @@ def fetch_dcids_by_name(
         entities: A single entity name or a list of entity names.
         entity_type: The type of the entity (e.g., "Country"). It must be a valid Data Commons type.
         chunk_size: The size of each chunk to split the list into. If None, no chunking is done.
+        max_workers: The maximum number of requests to make concurrently. If None or 1, requests
+            are made one after the other. Chunks are fetched first, and the entities of any chunks
+            that fail are then requested individually, with the same limit. Requests that fail
+            because of rate limiting or a server error are retried after a short delay.
 
     Returns:
         A dictionary mapping entity names to their corresponding DCIDs. If an entity name is not found, it will be mapped to None.
@@ -28,71 +98,93 @@ def fetch_dcids_by_name(
 
     logger.info(f"Disambiguating places using Data Commons API")
 
+    # a single entity name is a chunk of one, not a sequence of characters
+    if isinstance(entities, str):
+        entities = [entities]
+
+    # only request each entity once. The results are keyed by entity name, so duplicates
+    # in the input would be collapsed anyway
+    entities = list(dict.fromkeys(entities))
+
     if not chunk_size:
-        dcids = {}
-        try:
-            dcids = dc_client.resolve.fetch_dcids_by_name(
-                entities, entity_type
-            ).to_flat_dict()
-        except DCStatusError as e:
-            logger.debug(
-                f"Error fetching DCIDs for entities {entities} of type {entity_type}: {e}"
-            )
-            logger.debug(
-                "Resolving individual entities, and replacing unresolved places with None"
-            )
+        chunks = [entities]
+    else:
+        chunks = list(split_list(entities, chunk_size))
+
+    # fetch the chunks concurrently to overlap the time spent waiting on the API
+    results = map_concurrently(
+        lambda chunk: _fetch_chunk(dc_client, chunk, entity_type),
+        chunks,
+        max_workers,
+    )
+
+    # if a chunk fails, resolve its entities individually. The entities of all the failed
+    # chunks share a single pool, so no more than `max_workers` requests are made at once
+    failed = [
+        entity
+        for chunk, result in zip(chunks, results)
+        if result is None
+        for entity in chunk
+    ]
+    if failed:
+        logger.debug(
+            "Resolving individual entities, and replacing unresolved places with None"
+        )
+    entity_results = iter(
+        map_concurrently(
+            lambda entity: _fetch_entity(dc_client, entity, entity_type),
+            failed,
+            max_workers,
+        )
+    )
 
-            # if there is an error, resolve each entity individually
-            for entity in entities:
-                try:
-                    dcids[entity] = dc_client.resolve.fetch_dcids_by_name(
-                        entity, entity_type
-                    ).to_flat_dict()
-                except Exception as e:
-                    logger.debug(
-                        f"Error fetching DCID for {entity}. Resolving to None. Error: {e}"
-                    )
-                    dcids[entity] = None
+    # merge the results in the order of the chunks. A single chunk's result is a new dict
+    # that can be used as it is
+    if len(results) == 1 and results[0] is not None:
+        dcids = results[0]
     else:
         dcids = {}
-        for chunk in split_list(entities, chunk_size):
-            try:
-                chunk_dcids = dc_client.resolve.fetch_dcids_by_name(
-                    chunk, entity_type
-                ).to_flat_dict()
+        for chunk, chunk_dcids in zip(chunks, results):
+            if chunk_dcids is None:
+                for _ in chunk:
+                    dcids.update(next(entity_results))
+            else:
                 dcids.update(chunk_dcids)
-            except DCStatusError as e:
-                logger.debug(
-                    f"Error fetching DCIDs for chunk {chunk} of type {entity_type}: {e}"
-                )
-                logger.debug(
-                    "Resolving individual entities in the chunk, and replacing unresolved places with None"
-                )
 
-                # if there is an error, resolve each entity individually
-                for entity in chunk:
-                    try:
-                        # chunk_dcids[entity] = dc_client.resolve.fetch_dcids_by_name(entity, entity_type).to_flat_dict()
-                        chunk_dcid = dc_client.resolve.fetch_dcids_by_name(
-                            entity, entity_type
-                        ).to_flat_dict()
-                        dcids.update(chunk_dcid)
-                    except Exception as e:
-                        logger.debug(
-                            f"Error fetching DCID for {entity}. Resolving to None. Error: {e}"
-                        )
-                        chunk_dcid = {entity: None}
-                        dcids.update(chunk_dcid)
-
-    # replace empty lists with None
+    # drop duplicate and null candidates, and replace empty lists with None
     for k, v in dcids.items():
-        # if v is an empty list, replace it with None
-        if isinstance(v, list) and len(v) == 0:
-            dcids[k] = None
+        if isinstance(v, list):
+            # dict.fromkeys keeps the first occurrence of each candidate in order
+            v = [c for c in dict.fromkeys(v) if c is not None]
+            dcids[k] = v or None
 
     return dcids
 
 
+async def fetch_dcids_by_name_async(
+    dc_client: DataCommonsClient,
+    entities: str | list,
+    entity_type: str,
+    chunk_size: Optional[int] = 30,
+    max_workers: Optional[int] = 4,
+) -> dict[str, str | list | None]:
+    """Fetch DCIDs for a list of entities without blocking the event loop.
+
+    This runs `fetch_dcids_by_name` in a worker thread, so that callers using asyncio can
+    overlap several lookups with each other and with other I/O. The arguments and the result
+    are the same as for `fetch_dcids_by_name`.
+    """
+
+    return await asyncio.to_thread(
+        fetch_dcids_by_name,
+        dc_client,
+        entities,
+        entity_type,
+        chunk_size,
+        max_workers,
+    )
+
+
 def custom_disambiguation(entity: str, disambiguation_dict: dict) -> str | None:
     """Disambiguate a given entity name using special cases.
 
@@ -109,12 +201,34 @@ def custom_disambiguation(entity: str, disambiguation_dict: dict) -> str | None:
     return cleaned_dict.get(cleaned_string)
 
 
+def custom_disambiguation_many(
+    entities: list[str], disambiguation_dict: dict
+) -> list[str | None]:
+    """Disambiguate several entity names using special cases.
+
+    This gives the same results as calling `custom_disambiguation` for each entity, but the
+    disambiguation dictionary is only cleaned once and the entities are cleaned together.
+
+    Args:
+        entities: The entity names to disambiguate.
+        disambiguation_dict: A dictionary of special cases for disambiguation.
+
+    Returns:
+        The disambiguated DCID for each entity, in the same order, or None where there is no special case.
+    """
+
+    cleaned_dict = {clean_string(k): v for k, v in disambiguation_dict.items()}
+    cleaned = clean_series(pd.Series(entities, dtype=object))
+    return [cleaned_dict.get(key) for key in cleaned]
+
+
 def resolve_places_to_dcids(
     dc_client: DataCommonsClient,
     entities: str | list[str],
     entity_type: Optional[str],
     disambiguation_dict: Optional[dict] = None,
     chunk_size: Optional[int] = 30,
+    cache: Optional[dict] = None,
 ) -> dict[str, str | list | None]:
     """Disambiguate entities to their DCIDs
 
@@ -127,6 +241,9 @@ def resolve_places_to_dcids(
         entity_type: The type of the entity (e.g., "Country"). It must be a valid Data Commons type.
         disambiguation_dict: A dictionary of special cases for disambiguation.
         chunk_size: The size of each chunk to split the list into. If None, no chunking is done.
+        cache: A dictionary of previously fetched DCIDs keyed by entity name. Entities found in the
+            cache are not requested from the API, and newly resolved entities are added to it.
+            If None, no caching is done.
 
     Returns:
         A dictionary mapping entity names to their corresponding DCIDs. If an entity name is not found, it will be mapped to None.
@@ -137,10 +254,10 @@ def resolve_places_to_dcids(
 
     # if there is any custom disambiguation, do that first
     if disambiguation_dict is not None:
-        # loop through the entities checking for edge cases
-        for entity in entities:
+        # look up all the entities at once, checking for edge cases
+        dcids = custom_disambiguation_many(entities, disambiguation_dict)
+        for entity, dcid in zip(entities, dcids):
             # if the entity is an edge case, add the dcid to the dictionary and remove the entity from the list
-            dcid = custom_disambiguation(entity, disambiguation_dict)
             if dcid is not None:
                 resolved_entities[entity] = dcid
             else:
@@ -150,6 +267,20 @@ def resolve_places_to_dcids(
         # if there is no custom disambiguation, add all entities to the list of entities to disambiguate
         entities_to_disambiguate = entities
 
+    # use any cached dcids and only fetch the entities that haven't been resolved before
+    if cache is not None and entities_to_disambiguate:
+        uncached_entities = []
+        for entity in entities_to_disambiguate:
+            dcid = cache.get(str(entity))
+            if dcid is not None:
+                # copy lists so the cached candidates can't be changed by the caller
+                resolved_entities[entity] = (
+                    list(dcid) if isinstance(dcid, list) else dcid
+                )
+            else:
+                uncached_entities.append(entity)
+        entities_to_disambiguate = uncached_entities
+
     # if there are still entities left, fetch the dcids from the datacommons client
     if entities_to_disambiguate:
         # fetch the dcids from the datacommons client
@@ -158,4 +289,15 @@ def resolve_places_to_dcids(
         )
         resolved_entities.update(dcids)
 
+        # cache the resolved entities. Places that were not found are not cached as they
+        # may be the result of a failed request
+        if cache is not None:
+            cache.update(
+                {
+                    str(k): list(v) if isinstance(v, list) else v
+                    for k, v in dcids.items()
+                    if v is not None
+                }
+            )
+
     return resolved_entities
@@ -5,17 +5,38 @@ that a user can access
 
 """
 
+from functools import lru_cache
 from bblocks.places.resolver import PlaceResolver
+from bblocks.places.concordance import get_concordance_mappers
 from bblocks.places.config import logger
 from typing import Optional, Literal
 import pandas as pd
 
-# instantiate a PlaceResolver object specific for countries
-_country_resolver = PlaceResolver(
-    concordance_table="default",
-    custom_disambiguation="default",
-    dc_entity_type="Country",
-)
+
+@lru_cache(maxsize=1)
+def _get_country_resolver() -> PlaceResolver:
+    """Get the PlaceResolver object specific for countries, creating it on first use
+
+    The resolver reads the default concordance table, so it is only created when it is first
+    needed rather than when the package is imported.
+    """
+
+    return PlaceResolver(
+        concordance_table="default",
+        custom_disambiguation="default",
+        dc_entity_type="Country",
+    )
+
+
+def __getattr__(name: str):
+    """Get the module attributes that depend on the country resolver, creating it on first use"""
+
+    if name == "_country_resolver":
+        return _get_country_resolver()
+    if name == "_VALID_CONCORDANCE_FIELDS":
+        return _get_country_resolver().concordance_table.columns.tolist()
+
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 def get_default_concordance_table() -> pd.DataFrame:
@@ -25,7 +46,7 @@ def get_default_concordance_table() -> pd.DataFrame:
         The default concordance table as a pandas DataFrame.
     """
 
-    return _country_resolver.concordance_table
+    return _get_country_resolver().concordance_table
 
 
 _VALID_SOURCES = [
@@ -49,7 +70,10 @@ _VALID_TARGETS = [
     "income_level",
 ]
 
-_VALID_CONCORDANCE_FIELDS = _country_resolver.concordance_table.columns.tolist()
+# sets of the valid sources and targets for the membership checks. The lists keep the order
+# used in error messages
+_VALID_SOURCES_SET = frozenset(_VALID_SOURCES)
+_VALID_TARGETS_SET = frozenset(_VALID_TARGETS)
 
 
 def _validate_place_format(place_format: str) -> None:
@@ -63,7 +87,7 @@ def _validate_place_format(place_format: str) -> None:
 
     """
 
-    if place_format not in _VALID_SOURCES:
+    if place_format not in _VALID_SOURCES_SET:
         raise ValueError(
             f"Invalid place format: {place_format}. Must be one of {_VALID_SOURCES}."
         )
@@ -80,23 +104,47 @@ def _validate_place_target(target_field: str) -> None:
 
     """
 
-    if target_field not in _VALID_TARGETS:
+    if target_field not in _VALID_TARGETS_SET:
         raise ValueError(
-            f"Invalid place format: {target_field}. Must be one of {_VALID_TARGETS}."
+            f"Invalid target field: {target_field}. Must be one of {_VALID_TARGETS}."
         )
 
 
-def _validate_filter_values(filter_category, filter_values: str | list[str]) -> None:
+def _as_seq(value) -> tuple:
+    """Return filter values as a tuple, wrapping a single value in a tuple of one."""
+
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return tuple(value)
+    return (value,)
+
+
+def _sorted_values(values: frozenset) -> list:
+    """Sort filter values for messages, comparing them as strings if they can't be compared"""
+
+    try:
+        return sorted(values)
+    except TypeError:
+        return sorted(values, key=str)
+
+
+def _format_filters(filters: dict[str, frozenset]) -> dict[str, list]:
+    """Format normalised filters for messages, with the values of each filter sorted"""
+
+    return {key: _sorted_values(values) for key, values in filters.items()}
+
+
+def _validate_filter_values(filter_category, filter_values: frozenset) -> None:
     """Validate the filter values ensuring they are available for the filter category."""
 
-    valid_values = list(
-        _country_resolver.concordance_table[filter_category].dropna().unique()
-    )
+    # the unique values of each category are found once per concordance table
+    valid_values, valid_set = get_concordance_mappers(
+        _get_country_resolver().concordance_table
+    ).unique_values(filter_category)
 
-    # ensure all the filter values are in the valid_values list
-    if not all(v in valid_values for v in filter_values):
+    # ensure all the filter values are in the valid values
+    if not all(v in valid_set for v in filter_values):
         raise ValueError(
-            f"Invalid filter values: {filter_values}. Must be one of {valid_values}."
+            f"Invalid filter values: {_sorted_values(filter_values)}. Must be one of {valid_values}."
         )
 
 
@@ -113,15 +161,14 @@ def _get_list_from_bool(target_field, bool_field, raise_if_empty: bool = False):
     # validate the target field
     _validate_place_format(target_field)
 
-    countries = _country_resolver.get_concordance_dict(
-        from_type=target_field, to_type=bool_field
+    # the places that are True for the field are found once per concordance table. Copy the
+    # shared list so the caller is free to change it
+    result = list(
+        get_concordance_mappers(_get_country_resolver().concordance_table).true_keys(
+            target_field, bool_field
+        )
     )
 
-    # filter only for values that are True
-    countries = {k: v for k, v in countries.items() if v is True}
-
-    result = list(countries.keys())
-
     if not result:
         msg = f"No places found for boolean field '{bool_field}'"
         if raise_if_empty:
@@ -375,7 +422,7 @@ def resolve_places(
     if from_type is not None:
         _validate_place_format(from_type)
 
-    return _country_resolver.resolve_places(
+    return _get_country_resolver().resolve_places(
         places=places,
         to_type=to_type,
         from_type=from_type,
@@ -464,7 +511,7 @@ def map_places(
     if from_type is not None:
         _validate_place_format(from_type)
 
-    return _country_resolver.map_places(
+    return _get_country_resolver().map_places(
         places=places,
         to_type=to_type,
         from_type=from_type,
@@ -551,14 +598,15 @@ def filter_places(
     if from_type is not None:
         _validate_place_format(from_type)
 
+    # normalise the filter values once, without changing the caller's dictionary
+    filters = {
+        category: frozenset(_as_seq(values)) for category, values in filters.items()
+    }
     for category, values in filters.items():
         # _validate_place_target(category)
-        if not isinstance(values, list):
-            values = [values]
-            filters[category] = values
         _validate_filter_values(category, values)
 
-    result = _country_resolver.filter_places(
+    result = _get_country_resolver().filter_places(
         places=places,
         filters=filters,
         from_type=from_type,
@@ -573,7 +621,7 @@ def filter_places(
         empty = True
 
     if empty:
-        msg = f"No places found for filters {filters}"
+        msg = f"No places found for filters {_format_filters(filters)}"
         if raise_if_empty:
             raise ValueError(msg)
         logger.warning(msg)
@@ -699,19 +747,21 @@ def get_places(
 
     _validate_place_format(place_format)
 
+    # normalise the filter values once, without changing the caller's dictionary
+    filters = {key: frozenset(_as_seq(value)) for key, value in filters.items()}
     for key, value in filters.items():
-        if not isinstance(value, list):
-            value = [value]
-            filters[key] = value
         _validate_filter_values(key, value)
 
-    query = " and ".join([f"{k} in {v}" for k, v in filters.items()])
+    # the places for each set of filters are found once per concordance table. Copy the
+    # shared list so the caller is free to change it
     result = list(
-        _country_resolver.concordance_table.query(query)[place_format].dropna().unique()
+        get_concordance_mappers(_get_country_resolver().concordance_table).places(
+            place_format, filters
+        )
     )
 
     if not result:
-        msg = f"No places found for filters {filters}"
+        msg = f"No places found for filters {_format_filters(filters)}"
         if raise_if_empty:
             raise ValueError(msg)
         logger.warning(msg)
@@ -3,15 +3,21 @@ This module contains the PlaceResolver class which is used to resolve places to
 using Data Commons and/or a custom concordance table
 """
 
+from functools import lru_cache
+from itertools import chain
 from os import PathLike
 from datacommons_client import DataCommonsClient
 from typing import Optional, Literal
+import numpy as np
 import pandas as pd
 
 from importlib import resources
 
+from bblocks.places.cache import DCCache
+from bblocks.places.utils import format_values
 from bblocks.places.disambiguator import resolve_places_to_dcids
 from bblocks.places.concordance import (
+    get_concordance_mappers,
     map_candidates,
     map_places,
     validate_concordance_table,
@@ -21,6 +27,8 @@ from bblocks.places.config import (
     logger,
     PlaceNotFoundError,
     MultipleCandidatesError,
+    NotFoundBehavior,
+    MultipleCandidatesBehavior,
 )
 
 # Default concordance table dtypes
@@ -50,6 +58,19 @@ DEFAULT_CONCORDANCE_DTYPES: dict = {
 }
 
 
+def _handle_nulls(ignore_nulls: bool) -> None:
+    """Warn that null places will be ignored, or raise an error if nulls are not ignored
+
+    Raises:
+        ValueError if ignore_nulls is False
+    """
+
+    if not ignore_nulls:
+        raise ValueError("Null values found in places input")
+
+    logger.warning("Null values detected and will be ignored when resolving places")
+
+
 def handle_not_founds(
     candidates: dict[str, str | list | None],
     not_found: Literal["raise", "ignore"] | str,
@@ -65,25 +86,32 @@ def handle_not_founds(
             - Any other string to set as the value for not found places.
 
     Returns:
-        The candidates with not found places handled
+        The candidates with not found places handled. The input dictionary is not modified, and
+        is returned as it is if there is nothing to replace.
 
     Raises:
         PlaceNotFoundError if the function is set to raise an error when places cannot be resolved
 
     """
 
-    for place, cands in candidates.items():
-        # if the candidate is None, then raise an error
-        if cands is None:
-            if not_found == "raise":
-                raise PlaceNotFoundError(f"Place not found: {place}")
-            elif not_found == "ignore":
-                logger.warning(f"Place not found: {place}. Resolving to None")
-                continue
-            else:
-                # set the value of the candidate to the not_found value
-                candidates[place] = not_found
-                logger.warning(f"Place not found: {place}. Resolving to: {not_found}")
+    not_found_places = [place for place, cands in candidates.items() if cands is None]
+    if not not_found_places:
+        return candidates
+
+    if not_found == NotFoundBehavior.RAISE:
+        raise PlaceNotFoundError(f"Place not found: {not_found_places[0]}")
+
+    # log a single message for all the places that could not be resolved
+    if not_found == NotFoundBehavior.IGNORE:
+        logger.warning(
+            f"Places not found: {format_values(not_found_places)}. Resolving to None"
+        )
+    else:
+        logger.warning(
+            f"Places not found: {format_values(not_found_places)}. Resolving to: {not_found}"
+        )
+        # set the value of the not found places to the not_found value
+        return candidates | dict.fromkeys(not_found_places, not_found)
 
     return candidates
 
@@ -104,53 +132,81 @@ def handle_multiple_candidates(
                 - "ignore": keep the value as a list.
 
     Returns:
-        The candidates with multiple candidate values handled
+        The candidates with multiple candidate values handled. The input dictionary is not
+        modified, and is returned as it is if there is nothing to replace.
 
     Raises:
         MultipleCandidatesError if the function is set to raise an error when multiple candidates exist
+        ValueError if multiple_candidates is not a valid option and there are places with
+            multiple candidates
 
     """
 
-    for place, cands in candidates.items():
-        # if the candidate is a list, then raise an error
-        if isinstance(cands, list):
-            if multiple_candidates == "raise":
-                raise MultipleCandidatesError(
-                    f"Multiple candidates found for {place}: {cands}"
-                )
-            elif multiple_candidates == "first":
-                # set the value of the candidate to the first value in the list
-                candidates[place] = cands[0]
-                logger.info(
-                    f"Multiple candidates found for {place}. Using first candidate: {cands[0]}"
-                )
-            elif multiple_candidates == "last":
-                # set the value of the candidate to the last value in the list
-                candidates[place] = cands[-1]
-                logger.info(
-                    f"Multiple candidates found for {place}. Using last candidate: {cands[-1]}"
-                )
-            elif multiple_candidates == "ignore":
-                # keep the value of the candidate as a list
-                logger.warning(
-                    f"Multiple candidates found for {place}. Keeping all candidates: {cands}"
-                )
+    multiple_places = [
+        place for place, cands in candidates.items() if isinstance(cands, list)
+    ]
+    if not multiple_places:
+        return candidates
 
-            else:
-                raise ValueError(
-                    f"Invalid value for multiple_candidates: {multiple_candidates}. Must be one of ['raise', 'first', 'last', 'ignore']"
-                )
+    # resolve the behaviour once rather than for each place. The option is only checked when
+    # there are places with multiple candidates
+    try:
+        behavior = MultipleCandidatesBehavior(multiple_candidates)
+    except ValueError:
+        raise ValueError(
+            f"Invalid value for multiple_candidates: {multiple_candidates}. Must be one of ['raise', 'first', 'last', 'ignore']"
+        ) from None
+
+    # the position of the candidate to keep when a single candidate is selected
+    index = {
+        MultipleCandidatesBehavior.FIRST: 0,
+        MultipleCandidatesBehavior.LAST: -1,
+    }.get(behavior)
+
+    if behavior is MultipleCandidatesBehavior.RAISE:
+        place = multiple_places[0]
+        raise MultipleCandidatesError(
+            f"Multiple candidates found for {place}: {candidates[place]}"
+        )
+
+    if index is not None:
+        # set the value of the candidates to the first or last value in the list
+        candidates = candidates | {
+            place: candidates[place][index] for place in multiple_places
+        }
+
+    # log a single message for all the places with multiple candidates
+    if behavior is MultipleCandidatesBehavior.IGNORE:
+        # the values of the candidates are kept as lists
+        logger.warning(
+            f"Multiple candidates found for {format_values(multiple_places)}. Keeping all candidates"
+        )
+    else:
+        logger.info(
+            f"Multiple candidates found for {format_values(multiple_places)}. Using {behavior.value} candidate"
+        )
 
     return candidates
 
 
-def read_default_concordance_table() -> pd.DataFrame:
-    """Read the default concordance table"""
+@lru_cache(maxsize=1)
+def _parse_default_concordance_table() -> pd.DataFrame:
+    """Parse the bundled concordance CSV. The file is only parsed once"""
 
     path = resources.files("bblocks.places").joinpath("concordance.csv")
     return pd.read_csv(path, dtype=DEFAULT_CONCORDANCE_DTYPES)
 
 
+def read_default_concordance_table() -> pd.DataFrame:
+    """Read the default concordance table
+
+    The bundled file is parsed on the first call. Later calls return a copy of the parsed table,
+    so callers are free to modify it.
+    """
+
+    return _parse_default_concordance_table().copy()
+
+
 class PlaceResolver:
     """A class to resolve places
 
@@ -186,6 +242,13 @@ class PlaceResolver:
                 api_key – The API key for authentication
                 dc_instance – The Data Commons instance to use. Defaults to "datacommons.one.org" if not set
                 url – A custom, fully resolved URL for the Data Commons API. Defaults to None if not set
+        cache_dir: A directory to persist the results of the Data Commons API to. Default is None.
+            Results are always cached in memory for the lifetime of the object, keeping up to 10,000 of the most
+            recent results of each kind. If a directory is provided, they
+            are also saved to disk and reused by any resolver created with the same directory, Data Commons
+            instance and entity type.
+        cache_ttl: The number of seconds cached results are kept for before they are fetched again. Default is
+            86400 (one day). If None, cached results do not expire.
 
     Usage:
 
@@ -273,8 +336,11 @@ class PlaceResolver:
 
     """
 
-    # Shared class-level concordance table (loaded once).
-    _CONCORDANCE_TABLE = read_default_concordance_table()
+    # Shared class-level concordance table, read the first time a resolver uses the default table
+    _CONCORDANCE_TABLE: Optional[pd.DataFrame] = None
+
+    # The default concordance table that has been validated, so it is only validated once
+    _VALIDATED_DEFAULT_TABLE: Optional[pd.DataFrame] = None
 
     # Shared class-level disambiguation rules
     # These are edge cases specific to working with countries based on the M49 list of countries and the current
@@ -307,29 +373,33 @@ class PlaceResolver:
         dc_entity_type: Optional[str] = None,
         *,
         dc_api_settings: Optional[dict] = None,
+        cache_dir: Optional[str | PathLike] = None,
+        cache_ttl: Optional[float] = 86_400,
     ):
 
-        # set the Data Commons client
+        # set the Data Commons client settings. The client is created the first time it is needed,
+        # as places resolved with the concordance table alone never use it
         if dc_api_settings:
-            self._dc_client = DataCommonsClient(**dc_api_settings)
-        else:
-            self._dc_client = DataCommonsClient(dc_instance="datacommons.one.org")
-
-        # set the concordance table
-        # if the concordance table is a string and is "default", then use the default concordance table
-        if isinstance(concordance_table, str):
-            if concordance_table == "default":
-                self._concordance_table = self._CONCORDANCE_TABLE
-            else:
-                raise ValueError(
-                    f"Invalid value for concordance_table: {concordance_table}. Must be 'default' or a pandas DataFrame"
-                )
+            self._dc_api_settings = dict(dc_api_settings)
+            dc_instance = (
+                dc_api_settings.get("url")
+                or dc_api_settings.get("dc_instance")
+                or "datacommons.org"
+            )
         else:
-            self._concordance_table = concordance_table
+            self._dc_api_settings = {"dc_instance": "datacommons.one.org"}
+            dc_instance = "datacommons.one.org"
+        self._dc_client_instance: Optional[DataCommonsClient] = None
+
+        # set the cache for Data Commons API results, separate for each instance and entity type
+        self._dc_cache = DCCache(
+            cache_dir=cache_dir,
+            namespace=f"{dc_instance}/{dc_entity_type}",
+            ttl=cache_ttl,
+        )
 
-        # validate the concordance table
-        if self._concordance_table is not None:
-            validate_concordance_table(self._concordance_table)
+        # set and validate the concordance table
+        self.set_concordance_table(concordance_table)
 
         self._dc_entity_type = dc_entity_type  # set the Data Commons entity type
 
@@ -339,6 +409,33 @@ class PlaceResolver:
         else:
             self._custom_disambiguation = custom_disambiguation
 
+    @property
+    def _dc_client(self) -> DataCommonsClient:
+        """The Data Commons client, created with the resolver's API settings on first use"""
+
+        if self._dc_client_instance is None:
+            self._dc_client_instance = DataCommonsClient(**self._dc_api_settings)
+
+        return self._dc_client_instance
+
+    @classmethod
+    def _default_concordance_table(cls) -> pd.DataFrame:
+        """Get the default concordance table, reading it only once for all instances"""
+
+        if cls._CONCORDANCE_TABLE is None:
+            cls._CONCORDANCE_TABLE = read_default_concordance_table()
+
+        return cls._CONCORDANCE_TABLE
+
+    def _get_mapper(self, from_type: str, to_type: str) -> dict:
+        """Get the cleaned concordance dictionary to map from_type values to to_type values
+
+        The dictionary is built once for each concordance table and pair of types, and is shared by
+        all resolvers using the same table, for example the default concordance table.
+        """
+
+        return get_concordance_mappers(self._concordance_table).get(from_type, to_type)
+
     def _map_candidates_to_dc_property(
         self, candidates: dict[str, str | list | None], dc_property: str
     ) -> dict[str, str | list | None]:
@@ -359,26 +456,40 @@ class PlaceResolver:
 
         logger.info(f"Mapping to {dc_property} using Data Commons API")
 
-        # get a flattened list of dcids
-        dcids = [
-            v
-            for val in candidates.values()
-            for v in (val if isinstance(val, list) else [val])
-        ]
+        # get a flattened list of unique dcids, so each dcid is only requested once
+        dcids = list(
+            dict.fromkeys(
+                chain.from_iterable(
+                    val if isinstance(val, list) else [val]
+                    for val in candidates.values()
+                    if val is not None
+                )
+            )
+        )
         # fetch the properties from the Data Commons Node endpoint
-        dc_props = fetch_properties(self._dc_client, dcids, dc_property)
+        dc_props = {}
+        if dcids:
+            dc_props = fetch_properties(
+                self._dc_client,
+                dcids,
+                dc_property,
+                cache=self._dc_cache.section(f"property/{dc_property}"),
+            )
+            self._dc_cache.save()
 
-        # map the property values back to the original names
+        # map the property values back to the original names, in a new dictionary
+        get_prop = dc_props.get
+        result = {}
         for place, val in candidates.items():
             if isinstance(val, str):
-                candidates[place] = dc_props.get(val)
+                result[place] = get_prop(val)
             elif isinstance(val, list):
-                mapped = [dc_props.get(v) for v in val if dc_props.get(v)]
-                candidates[place] = mapped[0] if len(mapped) == 1 else (mapped or None)
+                mapped = list(filter(None, map(get_prop, val)))
+                result[place] = mapped[0] if len(mapped) == 1 else (mapped or None)
             else:
-                candidates[place] = None
+                result[place] = None
 
-        return candidates
+        return result
 
     def _resolve_with_disambiguation(
         self,
@@ -406,7 +517,9 @@ class PlaceResolver:
             entities=places_to_map,
             entity_type=self._dc_entity_type,
             disambiguation_dict=self._custom_disambiguation,
+            cache=self._dc_cache.section("dcids"),
         )
+        self._dc_cache.save()
 
         if to_type == "dcid":
             return handle_not_founds(candidates=dcid_map, not_found=not_found)
@@ -419,6 +532,7 @@ class PlaceResolver:
                 concordance_table=self._concordance_table,
                 candidates=dcid_map,
                 to_type=to_type,
+                concordance_dict=self._get_mapper("dcid", to_type),
             )
         else:
             candidates = self._map_candidates_to_dc_property(
@@ -443,12 +557,31 @@ class PlaceResolver:
         Node.
         """
 
+        # when both types are in the concordance table, map the places in a single lookup rather
+        # than through their dcids. Places whose row has no to_type value map to None
+        if (
+            from_type != "dcid"
+            and to_type != "dcid"
+            and to_type in self._concordance_table.columns
+        ):
+            candidates = map_places(
+                concordance_table=self._concordance_table,
+                places=places_to_map,
+                from_type=from_type,
+                to_type=to_type,
+                concordance_dict=get_concordance_mappers(self._concordance_table).get(
+                    from_type, to_type, include_nulls=True
+                ),
+            )
+            return handle_not_founds(candidates=candidates, not_found=not_found)
+
         if from_type != "dcid":
             dcid_map = map_places(
                 concordance_table=self._concordance_table,
                 places=places_to_map,
                 from_type=from_type,
                 to_type="dcid",
+                concordance_dict=self._get_mapper(from_type, "dcid"),
             )
         else:
             dcid_map = {place: place for place in places_to_map}
@@ -464,6 +597,7 @@ class PlaceResolver:
                 concordance_table=self._concordance_table,
                 candidates=dcid_map,
                 to_type=to_type,
+                concordance_dict=self._get_mapper("dcid", to_type),
             )
         else:
             candidates = self._map_candidates_to_dc_property(
@@ -513,12 +647,18 @@ class PlaceResolver:
         """
 
         # remove any custom mapping from the entities to map
-        places_to_map = [
-            p for p in places if not (custom_mapping and p in custom_mapping)
-        ]
+        if custom_mapping:
+            remaining = set(places).difference(custom_mapping)
+            # if the custom mapping covers all the places there is nothing left to resolve
+            if not remaining:
+                return dict(custom_mapping)
+            # keep the original order of the places
+            places_to_map = [p for p in places if p in remaining]
+        else:
+            places_to_map = places
 
         if not places_to_map:
-            return custom_mapping
+            return {}
 
         if not from_type:
             candidates = self._resolve_with_disambiguation(
@@ -623,13 +763,8 @@ class PlaceResolver:
 
         null_places = [p for p in places if pd.isna(p)]
         if null_places:
-            if ignore_nulls:
-                logger.warning(
-                    "Null values detected and will be ignored when resolving places"
-                )
-                places = [p for p in places if not pd.isna(p)]
-            else:
-                raise ValueError("Null values found in places input")
+            _handle_nulls(ignore_nulls)
+            places = [p for p in places if not pd.isna(p)]
 
         return self._resolve(
             places=places,
@@ -640,6 +775,61 @@ class PlaceResolver:
             custom_mapping=custom_mapping,
         )
 
+    def _resolve_values(
+        self,
+        places: pd.Series,
+        *,
+        ignore_nulls: bool = True,
+        **kwargs,
+    ) -> np.ndarray:
+        """Resolve a Series of places to an object array of the resolved values
+
+        The Series is factorized once. Only the unique places are resolved, and the results are
+        broadcast back to every row using the codes. Null places are kept as the original value.
+
+        Args:
+            places: The Series of places to resolve.
+            ignore_nulls: Whether to ignore null values. If False and nulls are present, an error is raised.
+            **kwargs: Additional keyword arguments to pass to `_resolve`.
+
+        Returns:
+            An object array with the resolved value of each place, in the order of the places.
+        """
+
+        # null places have a code of -1
+        codes, uniques = pd.factorize(places)
+        nulls = codes == -1
+        if nulls.any():
+            _handle_nulls(ignore_nulls)
+
+        mapper = self._resolve(places=list(uniques), **kwargs) if len(uniques) else {}
+
+        # look up each unique place once and broadcast back using the codes
+        resolved = np.empty(len(uniques) + 1, dtype=object)
+        for i, p in enumerate(uniques):
+            resolved[i] = mapper.get(p)
+        values = resolved[codes]
+
+        if nulls.any():
+            values[nulls] = places.to_numpy(dtype=object)[nulls]
+
+        return values
+
+    def _resolve_series(self, places: pd.Series, **kwargs) -> pd.Series:
+        """Resolve a Series of places, keeping its index
+
+        Args:
+            places: The Series of places to resolve.
+            **kwargs: Additional keyword arguments to pass to `_resolve_values`.
+
+        Returns:
+            A Series with the resolved places.
+        """
+
+        return pd.Series(
+            self._resolve_values(places, **kwargs).tolist(), index=places.index
+        )
+
     def resolve_places(
         self,
         places: str | int | list[str | int] | pd.Series,
@@ -695,9 +885,32 @@ class PlaceResolver:
             Resolved places in the desired format
         """
 
-        # get a mapping dictionary for the places
-        mapper = self.map_places(
-            places=places,
+        if isinstance(places, (str, int)):
+            # get a mapping dictionary for the place and return the resolved value
+            mapper = self.map_places(
+                places=places,
+                from_type=from_type,
+                to_type=to_type,
+                not_found=not_found,
+                multiple_candidates=multiple_candidates,
+                custom_mapping=custom_mapping,
+                ignore_nulls=ignore_nulls,
+            )
+            return mapper.get(places)
+
+        # lists are resolved in the same way as a Series, resolving each unique place once
+        # and broadcasting the results back to their original positions
+        is_list = isinstance(places, list)
+        if is_list:
+            places = pd.Series(places, dtype=object)
+        elif not isinstance(places, pd.Series):
+            raise ValueError(
+                f"Invalid type for places: {type(places)}. Must be one of [str, int, list[str | int], pd.Series]"
+            )
+
+        resolve = self._resolve_values if is_list else self._resolve_series
+        resolved = resolve(
+            places,
             from_type=from_type,
             to_type=to_type,
             not_found=not_found,
@@ -706,29 +919,18 @@ class PlaceResolver:
             ignore_nulls=ignore_nulls,
         )
 
-        # convert back to the original format replacing the original places with the resolved places
-        if isinstance(places, (str, int)):
-            return mapper.get(places)
-
-        elif isinstance(places, pd.Series):
-            resolved_list = [p if pd.isna(p) else mapper.get(p) for p in places]
-            return pd.Series(resolved_list, index=places.index)
-
-        else:
-            result = []
-            for p in places:
-                if pd.isna(p):
-                    if ignore_nulls:
-                        result.append(p)
-                    else:
-                        raise ValueError("Null values found in places input")
-                else:
-                    result.append(mapper.get(p))
-            return result
+        # lists are returned from the object array, so the values keep their types rather than
+        # being converted by pandas, for example integers with None to floats with nan
+        return resolved.tolist() if is_list else resolved
 
     @property
     def concordance_table(self) -> pd.DataFrame:
-        """Get the concordance table"""
+        """Get the concordance table
+
+        This is the table used by the resolver, not a copy. The resolver uses the table as it was
+        when it was set, so changes made to it in place are not used to resolve places until the
+        table is set again with `set_concordance_table`.
+        """
 
         # raise an error if there is no concordance table set
         if self._concordance_table is None:
@@ -738,19 +940,55 @@ class PlaceResolver:
 
     @classmethod
     def from_concordance_csv(
-        cls, concordance_csv_path: str | PathLike, *args, **kwargs
+        cls,
+        concordance_csv_path: str | PathLike,
+        *args,
+        columns: Optional[list[str]] = None,
+        dtype: Optional[dict] = None,
+        **kwargs,
     ) -> "PlaceResolver":
         """Create a PlaceResolver instance using a CSV file for the concordance table.
 
         Args:
             concordance_csv_path: Path to the CSV file containing the concordance table.
             *args: Additional arguments to pass to the constructor.
+            columns: The columns to read. Other columns are skipped while parsing. If None, all
+                columns are read. The columns must include "dcid".
+            dtype: The dtypes of the columns, for example `DEFAULT_CONCORDANCE_DTYPES` for a file
+                with the same schema as the default table. If None, pandas infers the dtypes.
+            **kwargs: Additional keyword arguments to pass to the constructor.
+
+        Returns:
+            PlaceResolver: An instance of PlaceResolver with the specified concordance table.
+        """
+        concordance_table = pd.read_csv(
+            concordance_csv_path, usecols=columns, dtype=dtype
+        )
+
+        return cls(
+            concordance_table=concordance_table,
+            *args,
+            **kwargs,
+        )
+
+    @classmethod
+    def from_concordance_parquet(
+        cls, concordance_parquet_path: str | PathLike, *args, **kwargs
+    ) -> "PlaceResolver":
+        """Create a PlaceResolver instance using a Parquet file for the concordance table.
+
+        Parquet files store typed columns, so large concordance tables load faster than from CSV and
+        keep their dtypes. Reading Parquet files requires pyarrow or fastparquet to be installed.
+
+        Args:
+            concordance_parquet_path: Path to the Parquet file containing the concordance table.
+            *args: Additional arguments to pass to the constructor.
             **kwargs: Additional keyword arguments to pass to the constructor.
 
         Returns:
             PlaceResolver: An instance of PlaceResolver with the specified concordance table.
         """
-        concordance_table = pd.read_csv(concordance_csv_path)
+        concordance_table = pd.read_parquet(concordance_parquet_path)
 
         return cls(
             concordance_table=concordance_table,
@@ -786,9 +1024,9 @@ class PlaceResolver:
         """
 
         # normalise filter values
-        normalised: dict[str, list[str]] = {}
+        normalised: dict[str, list[str] | tuple | set | frozenset] = {}
         for cat, vals in filters.items():
-            if isinstance(vals, list):
+            if isinstance(vals, (list, tuple, set, frozenset)):
                 normalised[cat] = vals
             else:
                 normalised[cat] = [vals]
@@ -811,17 +1049,25 @@ class PlaceResolver:
             multiple_candidates=multiple_candidates,
         )
 
-        result = places_unique
-        for category, values in normalised.items():
-            cat_map = self.get_concordance_dict("dcid", category, include_nulls=True)
-            filtered = []
-            for place in result:
-                dcid = dcid_map.get(place)
-                if isinstance(dcid, list) or dcid is None:
-                    continue
-                if cat_map.get(dcid) in values:
-                    filtered.append(place)
-            result = filtered
+        # without filters every place is kept, including places that were not resolved
+        if not normalised:
+            return list(places) if isinstance(places, list) else pd.Series(list(places))
+
+        # places that did not resolve to a single dcid cannot match any filter
+        dcids = [
+            None if isinstance(dcid, list) else dcid
+            for dcid in (dcid_map.get(place) for place in places_unique)
+        ]
+
+        # find the rows of the dcids with the dcid index of the table, which is built once per
+        # concordance table, and keep the places whose rows match all the filters
+        mappers = get_concordance_mappers(self.concordance_table)
+        rows = mappers.positions("dcid")
+        positions = np.array([rows.get(dcid, -1) for dcid in dcids], dtype=np.intp)
+        keep = (positions != -1) & mappers.mask(normalised)[positions]
+
+        # use a set for the membership checks, as places can be longer than the unique places
+        result = {place for place, k in zip(places_unique, keep) if k}
 
         if isinstance(places, list):
             return [p for p in places if p in result]
@@ -850,18 +1096,56 @@ class PlaceResolver:
             logger.warning(
                 "from_type and to_type are the same. Returning identical mapping."
             )
-            d = {v: v for v in self._concordance_table[from_type].dropna().unique()}
 
-        else:
-            raw_dict = self._concordance_table.set_index(from_type)[to_type].to_dict()
-            d = {k: v for k, v in raw_dict.items()}
+        # the dictionary is built once per concordance table and shared, so return a copy
+        # that the caller is free to change
+        return dict(
+            get_concordance_mappers(self._concordance_table).get_raw(
+                from_type, to_type, include_nulls
+            )
+        )
 
-        # if include_nulls then convert any nan to None
-        if include_nulls:
-            return {k: v if pd.notna(v) else None for k, v in d.items()}
+    def set_concordance_table(
+        self, concordance_table: None | pd.DataFrame | Literal["default"]
+    ) -> "PlaceResolver":
+        """Set the concordance table of the resolver.
 
-        # remove nan values
-        return {k: v for k, v in d.items() if pd.notna(v)}
+        The lookups used to resolve places are built from the table when it is set, and are shared by
+        all resolvers using the same table. Changes made to the table in place afterwards are not
+        used until the table is set again, which rebuilds the lookups from its current contents.
+
+        Args:
+            concordance_table: The new concordance table, "default" for the default concordance
+                table, or None to resolve places using Data Commons only.
+
+        Returns:
+            The updated PlaceResolver instance with the new concordance table.
+
+        Raises:
+            ValueError: If the concordance table is not valid.
+        """
+
+        # if the concordance table is a string and is "default", then use the default concordance table
+        if isinstance(concordance_table, str):
+            if concordance_table != "default":
+                raise ValueError(
+                    f"Invalid value for concordance_table: {concordance_table}. Must be 'default' or a pandas DataFrame"
+                )
+            concordance_table = self._default_concordance_table()
+
+            # the default table is shared and not modified, so it only needs to be validated once
+            if concordance_table is not type(self)._VALIDATED_DEFAULT_TABLE:
+                validate_concordance_table(concordance_table)
+                type(self)._VALIDATED_DEFAULT_TABLE = concordance_table
+
+        # validate the concordance table before replacing the current one
+        elif concordance_table is not None:
+            validate_concordance_table(concordance_table)
+            get_concordance_mappers(concordance_table, refresh=True)
+
+        self._concordance_table = concordance_table
+
+        return self
 
     def add_custom_disambiguation(self, custom_disambiguation: dict) -> "PlaceResolver":
         """Add custom disambiguation rules to the resolver.
@@ -874,9 +1158,24 @@ class PlaceResolver:
             The updated PlaceResolver instance with the custom disambiguation rules added.
         """
 
+        # merge into a new dictionary, as the current rules may be the class-level default rules
+        # shared by all resolvers, or a dictionary owned by the caller
         if self._custom_disambiguation is None:
-            self._custom_disambiguation = custom_disambiguation
+            self._custom_disambiguation = dict(custom_disambiguation)
         else:
-            self._custom_disambiguation.update(custom_disambiguation)
+            self._custom_disambiguation = (
+                self._custom_disambiguation | custom_disambiguation
+            )
+
+        return self
+
+    def clear_cache(self) -> "PlaceResolver":
+        """Clear the cached Data Commons API results, including any results saved to the cache directory.
+
+        Returns:
+            The PlaceResolver instance with an empty cache.
+        """
+
+        self._dc_cache.clear()
 
         return self
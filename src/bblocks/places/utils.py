@@ -1,7 +1,63 @@
 """Utility functions"""
 
+import sys
 import unicodedata
 import string
+from concurrent.futures import ThreadPoolExecutor
+from functools import cache, lru_cache
+from itertools import islice
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+import pandas as pd
+
+
+# Byte translation table that lowercases ASCII letters, and the ASCII punctuation and
+# whitespace bytes to delete, so ASCII strings can be cleaned in a single pass
+_ASCII_LOWER_TABLE = bytes.maketrans(
+    string.ascii_uppercase.encode(), string.ascii_lowercase.encode()
+)
+_ASCII_DELETE = bytes(
+    c for c in range(128) if chr(c) in string.punctuation or chr(c).isspace()
+)
+
+
+@cache
+def _remove_table() -> dict[int, None]:
+    """Translation table that removes the characters dropped by `clean_string`:
+    combining marks, punctuation and whitespace.
+
+    Scanning every code point for combining marks takes a noticeable amount of time, so the table
+    is built on first use rather than at import, and then reused.
+    """
+
+    table = {
+        c: None
+        for c in range(sys.maxunicode + 1)
+        if unicodedata.combining(chr(c)) or chr(c).isspace()
+    }
+    table.update({ord(c): None for c in string.punctuation})
+    return table
+
+
+# Characters below the Greek block can be cleaned one at a time, as lowercasing and normalising
+# them doesn't depend on the characters around them
+_FOLD_LIMIT = "\u0370"
+
+
+@cache
+def _fold_table() -> list[str]:
+    """Translation table that maps each character below `_FOLD_LIMIT` to its cleaned form.
+
+    This covers ASCII and the Latin blocks used by accented place names, so those names can be
+    cleaned in a single `str.translate` pass instead of being normalised. The table is a list
+    indexed by code point, which `str.translate` looks up faster than a dict.
+    """
+
+    return [
+        unicodedata.normalize("NFKD", chr(c).lower()).translate(_remove_table())
+        for c in range(ord(_FOLD_LIMIT))
+    ]
 
 
 def clean_string(s: str | int | float | None) -> str | None:
@@ -20,27 +76,132 @@ def clean_string(s: str | int | float | None) -> str | None:
     if s is None:
         return None
 
-    s = str(s)
+    return _clean_str(str(s))
+
+
+@lru_cache(maxsize=8192)
+def _clean_str(s: str) -> str:
+    """Clean a string as described in `clean_string`.
+
+    Place names are cleaned many times over with a small vocabulary, so the results are cached.
+    The cache is keyed on the string, so values that convert to the same string share an entry.
+    """
+
+    # ASCII strings have no accents or combining marks, so normalisation can be skipped
+    if s.isascii():
+        return _clean_ascii(s)
+
+    # most other place names only have accented Latin letters, which are folded directly
+    if max(s) < _FOLD_LIMIT:
+        return s.translate(_fold_table())
+
     s = unicodedata.normalize("NFKD", s.lower())
-    s = "".join(
-        c
-        for c in s
-        if not unicodedata.combining(c)
-        and c not in string.punctuation
-        and not c.isspace()
+
+    # some characters decompose to plain ASCII, for example ligatures and full-width letters.
+    # The string is already lowercase, so only punctuation and whitespace are removed
+    if s.isascii():
+        return s.encode("ascii").translate(None, _ASCII_DELETE).decode("ascii")
+
+    return s.translate(_remove_table())
+
+
+def _clean_ascii(s: str) -> str:
+    """Lowercase an ASCII string and remove punctuation and whitespace in a single pass"""
+
+    return (
+        s.encode("ascii").translate(_ASCII_LOWER_TABLE, _ASCII_DELETE).decode("ascii")
     )
-    return s
+
+
+def clean_series(s: pd.Series) -> pd.Series:
+    """Clean all the values of a Series in the same way as `clean_string`.
+
+    Each unique value is only cleaned once, so columns with many repeated values, such as
+    categorical columns, are cleaned in the time it takes to clean their unique values.
+
+    Args:
+        s: Input Series. Non-string values are converted to strings.
+
+    Returns:
+        A Series of cleaned strings with the same index. Null values are kept as they are.
+    """
+
+    # null values have a code of -1
+    codes, uniques = pd.factorize(s)
+
+    # pandas string methods loop over object arrays in Python once per method, so a single
+    # clean_string call per unique value, which has a fast path for ASCII, is quicker
+    cleaned = np.array([clean_string(v) for v in uniques], dtype=object)
+
+    values = s.to_numpy(dtype=object, copy=True)
+    notna = codes != -1
+    values[notna] = cleaned[codes[notna]]
+
+    return pd.Series(values, index=s.index, name=s.name)
+
+
+def format_values(values: list, max_values: int = 5) -> str:
+    """Format a list of values, such as places, for a message, truncating long lists
+
+    Args:
+        values: The values to format.
+        max_values: The maximum number of values to include in the message.
+
+    Returns:
+        A string listing the values, and how many were left out if the list was truncated.
+    """
+
+    if len(values) <= max_values:
+        return f"{values}"
+
+    return f"{values[:max_values]} and {len(values) - max_values} more"
 
 
 def split_list(lst, chunk_size):
     """Split a list into chunks of a specified size.
 
+    The chunks are taken lazily from an iterator over the list, so any iterable can be split.
+
     Args:
         lst: The list to split.
-        chunk_size: The size of each chunk.
+        chunk_size: The size of each chunk. If negative, no chunks are returned.
 
     Yields:
         Chunks of the list.
+
+    Raises:
+        ValueError: If chunk_size is 0.
     """
-    for i in range(0, len(lst), chunk_size):
-        yield lst[i : i + chunk_size]
+    if chunk_size == 0:
+        raise ValueError("chunk_size must not be 0")
+    if chunk_size < 0:
+        return
+
+    it = iter(lst)
+    while chunk := list(islice(it, chunk_size)):
+        yield chunk
+
+
+def map_concurrently(
+    func: Callable, items: Iterable, max_workers: Optional[int] = None
+) -> list:
+    """Apply a function to each item, using a thread pool when there is more than one item.
+
+    This is used to overlap the time spent waiting on API requests.
+
+    Args:
+        func: The function to apply.
+        items: The items to apply the function to.
+        max_workers: The maximum number of threads to use. If None or 1, the items are processed
+            one after the other.
+
+    Returns:
+        A list with the result for each item, in the order of the items.
+    """
+
+    items = list(items)
+    if not max_workers or max_workers <= 1 or len(items) <= 1:
+        return [func(item) for item in items]
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as executor:
+        return list(executor.map(func, items))
@@ -0,0 +1,127 @@
+"""Tests for the cache module."""
+
+import json
+
+from bblocks.places import cache as cache_module
+from bblocks.places.cache import DCCache
+
+
+def test_in_memory_cache_does_not_write(tmp_path):
+    """Without a cache_dir, entries are kept in memory and nothing is written."""
+    cache = DCCache()
+    cache.section("dcids")["Zimbabwe"] = "country/ZWE"
+    cache.save()
+
+    assert cache.section("dcids") == {"Zimbabwe": "country/ZWE"}
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cache_persists_across_instances(tmp_path):
+    """Saved entries are loaded by a new cache using the same directory and namespace."""
+    cache = DCCache(cache_dir=tmp_path, namespace="dc/Country")
+    cache.section("dcids")["Zimbabwe"] = "country/ZWE"
+    cache.save()
+
+    reloaded = DCCache(cache_dir=tmp_path, namespace="dc/Country")
+    assert reloaded.section("dcids") == {"Zimbabwe": "country/ZWE"}
+
+
+def test_cache_namespaces_are_kept_apart(tmp_path):
+    """Entries saved for one namespace are not visible to another, and both are kept on disk."""
+    countries = DCCache(cache_dir=tmp_path, namespace="dc/Country")
+    countries.section("dcids")["Italy"] = "country/ITA"
+    countries.save()
+
+    cities = DCCache(cache_dir=tmp_path, namespace="dc/City")
+    assert cities.section("dcids") == {}
+    cities.section("dcids")["Italy"] = "geoId/4837312"
+    cities.save()
+
+    assert DCCache(tmp_path, "dc/Country").section("dcids") == {"Italy": "country/ITA"}
+    assert DCCache(tmp_path, "dc/City").section("dcids") == {"Italy": "geoId/4837312"}
+
+
+def test_cache_ignores_corrupt_file(tmp_path):
+    """An unreadable cache file results in an empty cache rather than an error."""
+    (tmp_path / DCCache._FILE_NAME).write_text("not json")
+
+    cache = DCCache(cache_dir=tmp_path)
+    assert cache.section("dcids") == {}
+
+
+def test_cache_clear_removes_persisted_entries(tmp_path):
+    """clear() empties the cache in memory and on disk."""
+    cache = DCCache(cache_dir=tmp_path)
+    cache.section("dcids")["Zimbabwe"] = "country/ZWE"
+    cache.save()
+
+    cache.clear()
+
+    assert cache.section("dcids") == {}
+    assert DCCache(cache_dir=tmp_path).section("dcids") == {}
+
+
+def test_save_keeps_entries_saved_by_another_cache(tmp_path):
+    """Saving merges with the entries another cache saved to the same namespace since it was read."""
+    first = DCCache(cache_dir=tmp_path)
+    second = DCCache(cache_dir=tmp_path)
+
+    first.section("dcids")["Zimbabwe"] = "country/ZWE"
+    first.save()
+    second.section("dcids")["Italy"] = "country/ITA"
+    second.save()
+
+    assert DCCache(cache_dir=tmp_path).section("dcids") == {
+        "Zimbabwe": "country/ZWE",
+        "Italy": "country/ITA",
+    }
+
+
+def test_save_leaves_no_temporary_files(tmp_path):
+    """The cache file is written through a temporary file that is moved into place."""
+    cache = DCCache(cache_dir=tmp_path)
+    cache.section("dcids")["Zimbabwe"] = "country/ZWE"
+    cache.save()
+
+    assert [p.name for p in tmp_path.iterdir()] == [DCCache._FILE_NAME]
+
+
+def test_cache_keeps_the_newest_entries():
+    """Each section keeps at most max_entries entries, discarding the oldest on save."""
+    cache = DCCache(max_entries=2)
+    dcids = cache.section("dcids")
+    dcids.update({"a": "1", "b": "2", "c": "3"})
+    cache.save()
+
+    assert cache.section("dcids") == {"b": "2", "c": "3"}
+
+
+def test_expired_entries_are_discarded(tmp_path, monkeypatch):
+    """Entries older than the ttl are not loaded, while newer entries are kept."""
+    now = [1_000_000.0]
+    monkeypatch.setattr(cache_module.time, "time", lambda: now[0])
+
+    cache = DCCache(cache_dir=tmp_path, ttl=100)
+    cache.section("dcids")["Zimbabwe"] = "country/ZWE"
+    cache.save()
+    now[0] += 60
+    cache.section("dcids")["Italy"] = "country/ITA"
+    cache.save()
+
+    now[0] += 60
+    assert DCCache(cache_dir=tmp_path, ttl=100).section("dcids") == {
+        "Italy": "country/ITA"
+    }
+    assert DCCache(cache_dir=tmp_path, ttl=None).section("dcids") == {
+        "Zimbabwe": "country/ZWE",
+        "Italy": "country/ITA",
+    }
+
+
+def test_entries_without_times_are_discarded(tmp_path):
+    """Entries saved without the time they were added, by older versions, are not loaded."""
+    (tmp_path / DCCache._FILE_NAME).write_text(
+        json.dumps({"default": {"dcids": {"Zimbabwe": "country/ZWE"}}})
+    )
+
+    assert DCCache(cache_dir=tmp_path).section("dcids") == {}
@@ -1,5 +1,7 @@
 """Tests for the concordance module."""
 
+import gc
+
 import pandas as pd
 import pytest
 
@@ -43,6 +45,15 @@ def test_duplicate_dcid_values_raises():
     with pytest.raises(ValueError) as exc:
         concordance.validate_concordance_table(df)
     assert "values must be unique" in str(exc.value)
+    assert "['x']" in str(exc.value)
+
+
+def test_duplicate_dcid_values_message_is_truncated():
+    """Only the first few duplicated dcids are listed in the error message."""
+    df = pd.DataFrame({"dcid": [f"id{i}" for i in range(10)] * 2, "other": range(20)})
+    with pytest.raises(ValueError) as exc:
+        concordance.validate_concordance_table(df)
+    assert "['id0', 'id1', 'id2', 'id3', 'id4'] and 5 more" in str(exc.value)
 
 
 def test_single_column_dcid_only_raises():
@@ -66,6 +77,21 @@ def test_valid_concordance_table_passes():
     assert concordance.validate_concordance_table(df) is None
 
 
+@pytest.mark.parametrize(
+    "df, expected",
+    [
+        (pd.DataFrame({"dcid": ["a", "b"], "name": ["A", "B"]}), True),
+        (pd.DataFrame({"foo": [1, 2]}), False),
+        (pd.DataFrame({"dcid": ["a", "b"]}), False),
+        (pd.DataFrame({"dcid": ["a", "a"], "name": ["A", "B"]}), False),
+        (pd.DataFrame({"dcid": ["a", None], "name": ["A", "B"]}), False),
+    ],
+)
+def test_is_valid_concordance_table(df, expected):
+    """is_valid_concordance_table returns a bool instead of raising."""
+    assert concordance.is_valid_concordance_table(df) is expected
+
+
 # ——————————————————————————————————————————————————————————————————————————
 # get_concordance_dict tests
 # ——————————————————————————————————————————————————————————————————————————
@@ -226,6 +252,172 @@ def test_get_concordance_dict_numeric_identity(numeric_concordance_df):
     assert result["71"] == 71
 
 
+# ——————————————————————————————————————————————————————————————————————————
+# ConcordanceMappers tests
+# ——————————————————————————————————————————————————————————————————————————
+
+
+def test_shared_mappers_snapshot_the_table():
+    """The mappers keep the values the table had, until they are refreshed or the shape changes."""
+    df = pd.DataFrame({"dcid": ["a", "b"], "name": ["A", "B"]}, dtype=object)
+    mappers = concordance.get_concordance_mappers(df)
+
+    df.loc[0, "name"] = "Z"
+    assert concordance.get_concordance_mappers(df) is mappers
+    assert mappers.column("name").tolist() == ["A", "B"]
+
+    refreshed = concordance.get_concordance_mappers(df, refresh=True)
+    assert refreshed is not mappers
+    assert refreshed.column("name").tolist() == ["Z", "B"]
+
+    df["code"] = [1, 2]
+    assert concordance.get_concordance_mappers(df).column("code").tolist() == [1, 2]
+
+
+@pytest.mark.parametrize(
+    "from_type, to_type",
+    [
+        ("name_official", "dcid"),
+        ("iso3_code", "income_level"),
+        ("dcid", "dcid"),
+    ],
+)
+def test_concordance_mappers_match_get_concordance_dict(
+    master_concordance_df, from_type, to_type
+):
+    """ConcordanceMappers should build the same dictionaries as get_concordance_dict, and reuse them."""
+    mappers = concordance.ConcordanceMappers(master_concordance_df)
+    result = mappers.get(from_type, to_type)
+
+    assert result == concordance.get_concordance_dict(
+        master_concordance_df, from_type, to_type
+    )
+    assert mappers.get(from_type, to_type) is result
+
+
+def test_concordance_mappers_unique_values(master_concordance_df):
+    """unique_values lists the non-null values of a column in order, and caches them."""
+    mappers = concordance.ConcordanceMappers(master_concordance_df)
+    values, value_set = mappers.unique_values("income_level")
+
+    assert values == ["Lower middle income", "High income"]
+    assert value_set == frozenset(values)
+    assert mappers.unique_values("income_level")[0] is values
+
+
+def test_concordance_mappers_mask(master_concordance_df):
+    """mask ANDs the filters together, ignoring values that are not in a column."""
+    mappers = concordance.ConcordanceMappers(master_concordance_df)
+
+    mask = mappers.mask({"income_level": ["High income", "Upper middle income"]})
+    assert mask.tolist() == [False, True, True, False, False]
+
+    mask = mappers.mask(
+        {"income_level": ["Lower middle income"], "iso3_code": ["CPV", "ITA"]}
+    )
+    assert mask.tolist() == [False, False, False, False, True]
+
+    # nulls never match, and values missing from the column match nothing
+    assert not mappers.mask({"income_level": [None, "Unknown"]}).any()
+    assert mappers.mask({}).all()
+
+
+def test_concordance_mappers_places_memoizes(master_concordance_df, monkeypatch):
+    """places returns the matching values once and then reuses them, in any filter order."""
+    mappers = concordance.ConcordanceMappers(master_concordance_df)
+    filters = {"income_level": ("High income", "Lower middle income")}
+
+    result = mappers.places("iso3_code", filters)
+    assert result == ["ZWE", "ITA", "FRA", "CPV"]
+
+    monkeypatch.setattr(mappers, "mask", lambda filters: pytest.fail("not memoized"))
+    reordered = {"income_level": ("Lower middle income", "High income")}
+    assert mappers.places("iso3_code", reordered) is result
+
+
+def test_concordance_mappers_places_evicts_oldest(master_concordance_df, monkeypatch):
+    """Only the most recent filter results are kept."""
+    monkeypatch.setattr(concordance.ConcordanceMappers, "_MAX_CACHED_PLACES", 1)
+    mappers = concordance.ConcordanceMappers(master_concordance_df)
+
+    first = mappers.places("dcid", {"iso3_code": ("ZWE",)})
+    mappers.places("dcid", {"iso3_code": ("ITA",)})
+
+    assert mappers.places("dcid", {"iso3_code": ("ZWE",)}) is not first
+
+
+def test_concordance_mappers_get_include_nulls(master_concordance_df):
+    """With include_nulls, rows without a to_type value map to None instead of being dropped."""
+    mappers = concordance.ConcordanceMappers(master_concordance_df)
+
+    mapper = mappers.get("iso3_code", "income_level", include_nulls=True)
+    assert mapper["ala"] is None
+    assert mapper["zwe"] == "Lower middle income"
+    assert "ala" not in mappers.get("iso3_code", "income_level")
+
+
+def test_concordance_mappers_positions(master_concordance_df):
+    """positions maps the non-null values of a column to their row, and is built once."""
+    mappers = concordance.ConcordanceMappers(master_concordance_df)
+    positions = mappers.positions("income_level")
+
+    assert positions == {"Lower middle income": 4, "High income": 2}
+    assert mappers.positions("dcid")["country/ITA"] == 1
+    assert mappers.positions("income_level") is positions
+
+
+def test_get_concordance_dict_use_cache_shares_dict(master_concordance_df):
+    """With use_cache, the dictionary is built once per table and type pair and then shared."""
+    cached = concordance.get_concordance_dict(
+        master_concordance_df, "iso3_code", "dcid", use_cache=True
+    )
+
+    assert cached == concordance.get_concordance_dict(
+        master_concordance_df, "iso3_code", "dcid"
+    )
+    assert (
+        concordance.get_concordance_dict(
+            master_concordance_df, "iso3_code", "dcid", use_cache=True
+        )
+        is cached
+    )
+
+
+def test_shared_mappers_are_dropped_with_the_table():
+    """The shared mappers for a table are discarded once the table is garbage collected."""
+    df = pd.DataFrame({"dcid": ["a"], "name": ["A"]})
+    table_id = id(df)
+    concordance.get_concordance_mappers(df)
+    assert table_id in concordance._SHARED_MAPPERS
+
+    del df
+    gc.collect()
+
+    assert table_id not in concordance._SHARED_MAPPERS
+
+
+@pytest.mark.parametrize(
+    "from_type, to_type",
+    [
+        ("name_official", "dcid"),
+        ("iso3_code", "income_level"),
+        ("dcid", "dcid"),
+    ],
+)
+def test_string_dtype_table_matches_object_table(
+    master_concordance_df, from_type, to_type
+):
+    """A table with pandas string columns validates and maps the same as an object table."""
+    string_df = master_concordance_df.astype("string")
+    expected = concordance.get_concordance_dict(
+        master_concordance_df, from_type, to_type
+    )
+
+    assert concordance.validate_concordance_table(string_df) is None
+    assert concordance.get_concordance_dict(string_df, from_type, to_type) == expected
+    assert concordance.ConcordanceMappers(string_df).get(from_type, to_type) == expected
+
+
 # ——————————————————————————————————————————————————————————————————————————
 # _map_single_or_list tests
 # ——————————————————————————————————————————————————————————————————————————
@@ -291,7 +483,7 @@ def test_map_single_or_list_numeric_list(numeric_concordance_df):
     )
     result = concordance._map_single_or_list([4, 625], conc_dict)
     assert isinstance(result, list)
-    assert set(result) == {"country/FRA", "country/AFG"}
+    assert sorted(result) == ["country/AFG", "country/FRA"]
 
 
 def test_map_single_or_list_numeric_miss(numeric_concordance_df):
@@ -323,6 +515,20 @@ def test_map_places_basic_hits(master_concordance_df):
     }
 
 
+def test_map_places_nulls_and_misses(master_concordance_df):
+    """Null places and places missing from the table map to None."""
+    result = concordance.map_places(
+        master_concordance_df,
+        ["zimbabwe", None, float("nan"), "Nowhere"],
+        from_type="name_official",
+        to_type="dcid",
+    )
+    assert result["zimbabwe"] == "country/ZWE"
+    assert result[None] is None
+    assert result["Nowhere"] is None
+    assert list(result.values()).count(None) == 3
+
+
 def test_map_places_numeric_from_type(numeric_concordance_df):
     """map_places should work when places are numeric values (e.g. dac_code)."""
     result = concordance.map_places(
@@ -408,7 +614,7 @@ def test_map_candidates_list_multiple_hits(master_concordance_df):
         "iso3_code",
     )
     assert isinstance(result["Union"], list)
-    assert set(result["Union"]) == {"ZWE", "FRA"}
+    assert sorted(result["Union"]) == ["FRA", "ZWE"]
 
 
 def test_map_candidates_list_all_misses(master_concordance_df):
@@ -424,6 +630,23 @@ def test_map_candidates_list_all_misses(master_concordance_df):
     assert result == {"Nothing": None}
 
 
+def test_map_candidates_shared_candidates(master_concordance_df):
+    """
+    Candidates shared between places, as strings or in lists, should map the same way for each place.
+    """
+    candidates = {
+        "Zim": "country/ZWE",
+        "Both": ["country/ZWE", "country/ITA"],
+        "Also Zim": "Country/ZWE",
+    }
+    result = concordance.map_candidates(
+        master_concordance_df,
+        candidates,
+        "iso3_code",
+    )
+    assert result == {"Zim": "ZWE", "Both": ["ZWE", "ITA"], "Also Zim": "ZWE"}
+
+
 def test_map_candidates_empty_input(master_concordance_df):
     """
     An empty candidates dict should return an empty dict.
@@ -557,3 +780,32 @@ def test_fetch_properties_mixed_dcids():
     fake_client = FakeDCClient(response_map)
     result = concordance.fetch_properties(fake_client, ["A", "B", "C", "D"], "prop")
     assert result == {"A": "ValA", "B": "NameB", "C": ["C1", "C2"], "D": None}
+
+
+def test_fetch_properties_uses_cache_and_only_fetches_missing():
+    """
+    Cached dcids should not be requested, and fetched values should be added to the cache.
+    """
+    response_map = {(("B",), "prop"): {"B": FakeNode(value="ValB", name=None)}}
+    fake_client = FakeDCClient(response_map)
+    cache = {"A": "ValA"}
+
+    result = concordance.fetch_properties(fake_client, ["A", "B"], "prop", cache=cache)
+
+    assert result == {"A": "ValA", "B": "ValB"}
+    assert cache == {"A": "ValA", "B": "ValB"}
+
+
+def test_fetch_properties_chunks_requests():
+    """
+    DCIDs should be requested in chunks and the responses merged.
+    """
+    response_map = {
+        (("A", "B"), "prop"): {"A": FakeNode(value="ValA", name=None)},
+        (("C",), "prop"): {"C": FakeNode(value="ValC", name=None)},
+    }
+    fake_client = FakeDCClient(response_map)
+    result = concordance.fetch_properties(
+        fake_client, ["A", "B", "C"], "prop", chunk_size=2
+    )
+    assert result == {"A": "ValA", "C": "ValC"}
@@ -1,5 +1,10 @@
 """Disambiguator tests."""
 
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+
 import pytest
 
 from bblocks.places import disambiguator
@@ -24,13 +29,20 @@ class FakeResolveClient:
 
     def __init__(self, response_map):
         """
-        response_map: dict[(tuple(entities), entity_type), dict[str, list[str] or str]]
+        response_map: dict[str, list[str] or str], the response for each entity. Entities
+            that are not in the map are left out of the response.
         """
         self._response_map = response_map
+        # the (entities, entity_type) of each request, in the order they were made
+        self.calls = []
 
     def fetch_dcids_by_name(self, entities, entity_type):
-        key = (tuple(entities), entity_type)
-        mapping = self._response_map.get(key, {})
+        if isinstance(entities, str):
+            entities = [entities]
+        self.calls.append((tuple(entities), entity_type))
+        mapping = {
+            e: self._response_map[e] for e in entities if e in self._response_map
+        }
         return FakeResolveResponse(mapping)
 
 
@@ -57,10 +69,8 @@ def test_fetch_dcids_by_name_no_chunking_with_none_chunk_size():
     normalizing any empty lists to None.
     """
     response_map = {
-        (("A", "B"), "PlaceType"): {
-            "A": ["dcid/A"],
-            "B": [],  # will normalize [] → None
-        }
+        "A": ["dcid/A"],
+        "B": [],  # will normalize [] → None
     }
     client = FakeDCClient(response_map)
     result = disambiguator.fetch_dcids_by_name(
@@ -70,16 +80,18 @@ def test_fetch_dcids_by_name_no_chunking_with_none_chunk_size():
         "A": ["dcid/A"],
         "B": None,
     }
+    assert client.resolve.calls == [(("A", "B"), "PlaceType")]
 
 
 def test_fetch_dcids_by_name_chunk_size_zero_behaves_as_no_chunk():
     """
     chunk_size=0 is falsy: should behave like no-chunking.
     """
-    response_map = {(("X", "Y"), "Type"): {"X": ["1"], "Y": ["2"]}}
+    response_map = {"X": ["1"], "Y": ["2"]}
     client = FakeDCClient(response_map)
     result = disambiguator.fetch_dcids_by_name(client, ["X", "Y"], "Type", chunk_size=0)
     assert result == {"X": ["1"], "Y": ["2"]}
+    assert client.resolve.calls == [(("X", "Y"), "Type")]
 
 
 def test_fetch_dcids_by_name_with_chunking_and_normalization():
@@ -87,10 +99,7 @@ def test_fetch_dcids_by_name_with_chunking_and_normalization():
     With chunk_size > 0, should split into chunks, call API per chunk,
     merge the dicts, and normalize empty lists to None.
     """
-    response_map = {
-        (("A", "B"), "T"): {"A": ["1"], "B": []},
-        (("C",), "T"): {"C": ["3"]},
-    }
+    response_map = {"A": ["1"], "B": [], "C": ["3"]}
     client = FakeDCClient(response_map)
     # chunk_size=2 → splits ["A","B","C"] into ["A","B"] and ["C"]
     result = disambiguator.fetch_dcids_by_name(
@@ -101,6 +110,60 @@ def test_fetch_dcids_by_name_with_chunking_and_normalization():
         "B": None,
         "C": ["3"],
     }
+    assert client.resolve.calls == [(("A", "B"), "T"), (("C",), "T")]
+
+
+def test_fetch_dcids_by_name_async_matches_sync():
+    """The async wrapper returns the same merged and normalised result as the sync version."""
+    response_map = {"A": ["1"], "B": [], "C": ["3"]}
+    client = FakeDCClient(response_map)
+
+    async def fetch_both():
+        return await asyncio.gather(
+            disambiguator.fetch_dcids_by_name_async(
+                client, ["A", "B", "C"], "T", chunk_size=2
+            ),
+            disambiguator.fetch_dcids_by_name_async(client, ["C"], "T"),
+        )
+
+    first, second = asyncio.run(fetch_both())
+
+    assert first == {"A": ["1"], "B": None, "C": ["3"]}
+    assert second == {"C": ["3"]}
+
+
+def test_fetch_dcids_by_name_concurrent_chunks_keep_order():
+    """
+    Fetching chunks concurrently should give the same result, in the same order,
+    as fetching them one after the other.
+    """
+    entities = [f"E{i}" for i in range(10)]
+    response_map = {e: [f"dcid/{e}"] for e in entities}
+    client = FakeDCClient(response_map)
+
+    concurrent = disambiguator.fetch_dcids_by_name(
+        client, entities, "T", chunk_size=3, max_workers=4
+    )
+    sequential = disambiguator.fetch_dcids_by_name(
+        client, entities, "T", chunk_size=3, max_workers=None
+    )
+
+    assert list(concurrent.items()) == list(sequential.items())
+    assert list(concurrent) == entities
+
+
+def test_fetch_dcids_by_name_drops_duplicate_candidates():
+    """
+    Duplicate and null candidates returned by the API should be dropped,
+    keeping the first occurrence of each DCID in order.
+    """
+    response_map = {
+        "A": ["dcid/A", "dcid/A2", "dcid/A"],
+        "B": [None, "dcid/B", None],
+    }
+    client = FakeDCClient(response_map)
+    result = disambiguator.fetch_dcids_by_name(client, ["A", "B"], "T", chunk_size=None)
+    assert result == {"A": ["dcid/A", "dcid/A2"], "B": ["dcid/B"]}
 
 
 @pytest.mark.parametrize(
@@ -126,6 +189,19 @@ def test_custom_disambiguation_matches(entity, disamb_dict, expected):
     assert disambiguator.custom_disambiguation(entity, disamb_dict) == expected
 
 
+def test_custom_disambiguation_many_matches_single_lookups():
+    """The batch lookup gives the same result as looking up each entity on its own."""
+    disamb_dict = {"foo": "X", "Foo-Bar": "Y", "test": "T", "Côte": "Z"}
+    entities = ["FOO", "foo bar", "  test  ", "CÔTE", "Co\u0302te", "missing", None]
+
+    result = disambiguator.custom_disambiguation_many(entities, disamb_dict)
+
+    assert result == ["X", "Y", "T", "Z", "Z", None, None]
+    assert result == [
+        disambiguator.custom_disambiguation(e, disamb_dict) for e in entities
+    ]
+
+
 def test_custom_disambiguation_missing_returns_none():
     disamb_dict = {"a": "A"}
     assert disambiguator.custom_disambiguation("b", disamb_dict) is None
@@ -146,28 +222,27 @@ def test_resolve_places_no_disamb_no_chunk():
     No disambiguation dict and chunk_size=None → single API call,
     raw lists preserved.
     """
-    response_map = {(("A", "B"), "T"): {"A": ["1"], "B": ["2"]}}
+    response_map = {"A": ["1"], "B": ["2"]}
     client = FakeDCClient(response_map)
     result = disambiguator.resolve_places_to_dcids(
         client, ["A", "B"], "T", disambiguation_dict=None, chunk_size=None
     )
     assert result == {"A": ["1"], "B": ["2"]}
+    assert client.resolve.calls == [(("A", "B"), "T")]
 
 
 def test_resolve_places_chunking_merges_batches():
     """
     chunk_size>0 splits the list, makes multiple calls, and merges them.
     """
-    response_map = {
-        (("A", "B"), "T"): {"A": ["1"], "B": ["2"]},
-        (("C",), "T"): {"C": ["3"]},
-    }
+    response_map = {"A": ["1"], "B": ["2"], "C": ["3"]}
     client = FakeDCClient(response_map)
     # chunk_size=2 → ["A","B"] & ["C"]
     result = disambiguator.resolve_places_to_dcids(
         client, ["A", "B", "C"], "T", disambiguation_dict=None, chunk_size=2
     )
     assert result == {"A": ["1"], "B": ["2"], "C": ["3"]}
+    assert client.resolve.calls == [(("A", "B"), "T"), (("C",), "T")]
 
 
 def test_resolve_places_with_disambiguation_prefilter():
@@ -175,13 +250,14 @@ def test_resolve_places_with_disambiguation_prefilter():
     Entities in disambiguation_dict are taken first and not sent to API;
     the rest are fetched.
     """
-    response_map = {(("Y",), "T"): {"Y": ["yid"]}}
+    response_map = {"X": ["api-xid"], "Y": ["yid"]}
     client = FakeDCClient(response_map)
     disamb = {"X": "xid"}
     result = disambiguator.resolve_places_to_dcids(
         client, ["X", "Y"], "T", disambiguation_dict=disamb, chunk_size=None
     )
     assert result == {"X": "xid", "Y": ["yid"]}
+    assert client.resolve.calls == [(("Y",), "T")]
 
 
 def test_resolve_places_not_found_becomes_none():
@@ -189,7 +265,7 @@ def test_resolve_places_not_found_becomes_none():
     If the API returns no entries for the requested entities,
     resolve_places_to_dcids should return an empty dict (no keys).
     """
-    response_map = {(("Z",), "T"): {}}  # server returns no mapping for "Z"
+    response_map = {}  # server returns no mapping for "Z"
     client = FakeDCClient(response_map)
     result = disambiguator.resolve_places_to_dcids(
         client, ["Z"], "T", disambiguation_dict=None, chunk_size=None
@@ -197,6 +273,22 @@ def test_resolve_places_not_found_becomes_none():
     assert result == {}
 
 
+def test_resolve_places_uses_cache_and_skips_api():
+    """
+    Entities in the cache are not sent to the API, newly resolved entities
+    are added to the cache, and not found entities are not cached.
+    """
+    response_map = {"A": ["api-aid"], "B": ["bid"], "C": []}
+    client = FakeDCClient(response_map)
+    cache = {"A": ["aid"]}
+    result = disambiguator.resolve_places_to_dcids(
+        client, ["A", "B", "C"], "T", chunk_size=None, cache=cache
+    )
+    assert result == {"A": ["aid"], "B": ["bid"], "C": None}
+    assert client.resolve.calls == [(("B", "C"), "T")]
+    assert cache == {"A": ["aid"], "B": ["bid"]}
+
+
 def test_fetch_dcids_handles_dcstatuserror_and_sets_none(monkeypatch):
     """When bulk call raises DCStatusError, unresolved entities map to None."""
 
@@ -231,3 +323,113 @@ def test_fetch_dcids_handles_dcstatuserror_with_chunking(monkeypatch):
     result = disambiguator.fetch_dcids_by_name(client, ["A", "B"], "T", chunk_size=2)
 
     assert result == {"A": ["dcid/A"], "B": None}
+
+
+def test_fetch_dcids_fallback_resolves_entities_concurrently_in_order(monkeypatch):
+    """Individual requests made after a failed chunk are merged in the order of the entities."""
+
+    def raise_for_bulk(entities, entity_type):
+        if isinstance(entities, (list, tuple)):
+            raise disambiguator.DCStatusError("boom")
+        if entities == "C":
+            raise Exception("not resolvable")
+        return FakeResolveResponse({entities: [f"dcid/{entities}"]})
+
+    client = FakeDCClient(response_map={})
+    monkeypatch.setattr(client.resolve, "fetch_dcids_by_name", raise_for_bulk)
+
+    result = disambiguator.fetch_dcids_by_name(
+        client, ["A", "B", "C", "D"], "T", chunk_size=None, max_workers=4
+    )
+
+    assert list(result) == ["A", "B", "C", "D"]
+    assert result == {"A": ["dcid/A"], "B": ["dcid/B"], "C": None, "D": ["dcid/D"]}
+
+
+def test_fetch_dcids_fallback_respects_max_workers(monkeypatch):
+    """Requests for failed chunks and their entities never exceed max_workers at once."""
+    lock = threading.Lock()
+    active = [0]
+    peak = [0]
+
+    def slow_fetch(entities, entity_type):
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        if isinstance(entities, (list, tuple)):
+            raise disambiguator.DCStatusError("boom")
+        return FakeResolveResponse({entities: [f"dcid/{entities}"]})
+
+    client = FakeDCClient(response_map={})
+    monkeypatch.setattr(client.resolve, "fetch_dcids_by_name", slow_fetch)
+
+    entities = [f"E{i}" for i in range(12)]
+    result = disambiguator.fetch_dcids_by_name(
+        client, entities, "T", chunk_size=3, max_workers=2
+    )
+
+    assert result == {e: [f"dcid/{e}"] for e in entities}
+    assert list(result) == entities
+    assert peak[0] <= 2
+
+
+def _status_error(status_code):
+    error = disambiguator.DCStatusError(f"status {status_code}")
+    error.response = SimpleNamespace(status_code=status_code)
+    return error
+
+
+def test_fetch_dcids_retries_transient_errors(monkeypatch):
+    """Requests failing with a rate limit or server error are retried before falling back."""
+    calls = []
+
+    def flaky_fetch(entities, entity_type):
+        calls.append(entities)
+        if len(calls) <= 2:
+            raise _status_error(429 if len(calls) == 1 else 503)
+        return FakeResolveResponse({e: [f"dcid/{e}"] for e in entities})
+
+    client = FakeDCClient(response_map={})
+    monkeypatch.setattr(client.resolve, "fetch_dcids_by_name", flaky_fetch)
+    monkeypatch.setattr(disambiguator, "_RETRY_BACKOFF", 0)
+
+    result = disambiguator.fetch_dcids_by_name(client, ["A", "B"], "T")
+
+    assert result == {"A": ["dcid/A"], "B": ["dcid/B"]}
+    assert calls == [["A", "B"]] * 3
+
+
+def test_fetch_dcids_does_not_retry_other_errors(monkeypatch):
+    """Errors that are not transient, or that persist after the retries, are not retried further."""
+    calls = []
+
+    def failing_fetch(entities, entity_type):
+        calls.append(entities)
+        if isinstance(entities, list):
+            raise _status_error(400)
+        raise _status_error(500)
+
+    client = FakeDCClient(response_map={})
+    monkeypatch.setattr(client.resolve, "fetch_dcids_by_name", failing_fetch)
+    monkeypatch.setattr(disambiguator, "_RETRY_BACKOFF", 0)
+
+    result = disambiguator.fetch_dcids_by_name(client, ["A"], "T")
+
+    assert result == {"A": None}
+    assert calls == [["A"]] + ["A"] * (disambiguator._MAX_RETRIES + 1)
+
+
+def test_fetch_dcids_by_name_requests_duplicates_once():
+    """Duplicate entities are only sent to the API once."""
+    response_map = {"A": ["dcid/A"], "B": ["dcid/B"]}
+    client = FakeDCClient(response_map)
+
+    result = disambiguator.fetch_dcids_by_name(
+        client, ["A", "B", "A", "B"], "T", chunk_size=None
+    )
+
+    assert result == {"A": ["dcid/A"], "B": ["dcid/B"]}
+    assert client.resolve.calls == [(("A", "B"), "T")]
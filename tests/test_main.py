@@ -1,5 +1,8 @@
 """Tests for the main module."""
 
+import subprocess
+import sys
+
 import pytest
 import pandas as pd
 import logging
@@ -20,6 +23,29 @@ def test_get_default_concordance_table_returns_internal_table(monkeypatch):
     assert main.get_default_concordance_table() is dummy
 
 
+def test_import_does_not_read_default_concordance_table():
+    """Importing the package does not read the default concordance table."""
+    code = (
+        "import pandas as pd\n"
+        "reads = []\n"
+        "read_csv = pd.read_csv\n"
+        "pd.read_csv = lambda *a, **k: reads.append(1) or read_csv(*a, **k)\n"
+        "import bblocks.places\n"
+        "assert not reads, reads\n"
+        "bblocks.places.get_default_concordance_table()\n"
+        "assert len(reads) == 1, reads\n"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)
+
+
+def test_country_resolver_is_created_once():
+    """The country resolver is created on first use and shared by later calls."""
+    assert main._country_resolver is main._get_country_resolver()
+    assert main._VALID_CONCORDANCE_FIELDS == (
+        main.get_default_concordance_table().columns.tolist()
+    )
+
+
 @pytest.mark.parametrize("fmt", ["dcid", "name_official", "iso3_code"])
 def test_validate_place_format_accepts_valid_formats(fmt):
     """_validate_place_format should accept any known source formats without error."""
@@ -45,8 +71,7 @@ def test_validate_place_target_rejects_invalid_target():
     """_validate_place_target should raise ValueError on invalid targets."""
     with pytest.raises(ValueError) as exc:
         main._validate_place_target("not_a_valid_target")
-    # it currently uses the same wording as format errors
-    assert "Invalid place format" in str(exc.value)
+    assert "Invalid target field" in str(exc.value)
 
 
 # ----------------------------------------------
@@ -143,13 +168,10 @@ BOOLEAN_GETTERS = [
 @pytest.mark.parametrize("func,bool_field", BOOLEAN_GETTERS)
 def test_boolean_getter_returns_only_true(monkeypatch, func, bool_field):
     """Each getter should return only the keys with True values."""
-    sample = {"A": True, "B": False, "C": True}
-    # stub get_concordance_dict on the resolver
-    monkeypatch.setattr(
-        main._country_resolver,
-        "get_concordance_dict",
-        lambda from_type, to_type: sample,
-    )
+    df = pd.DataFrame(
+        {"dcid": ["A", "B", "C", "D"], bool_field: [True, False, True, None]}
+    ).astype({bool_field: "boolean"})
+    monkeypatch.setattr(main._country_resolver, "_concordance_table", df)
     out = func(place_format="dcid")
     assert out == ["A", "C"]
 
@@ -157,11 +179,8 @@ def test_boolean_getter_returns_only_true(monkeypatch, func, bool_field):
 @pytest.mark.parametrize("func,bool_field", BOOLEAN_GETTERS)
 def test_boolean_getter_empty_returns_empty_list(monkeypatch, caplog, func, bool_field):
     """When no entries are True, each getter returns [] and logs a warning by default."""
-    monkeypatch.setattr(
-        main._country_resolver,
-        "get_concordance_dict",
-        lambda from_type, to_type: {"X": False},
-    )
+    df = pd.DataFrame({"dcid": ["X"], bool_field: [False]})
+    monkeypatch.setattr(main._country_resolver, "_concordance_table", df)
     caplog.set_level("WARNING")
     out = func(place_format="dcid")
     assert out == []
@@ -171,16 +190,24 @@ def test_boolean_getter_empty_returns_empty_list(monkeypatch, caplog, func, bool
 @pytest.mark.parametrize("func,bool_field", BOOLEAN_GETTERS)
 def test_boolean_getter_empty_raise_if_empty(monkeypatch, func, bool_field):
     """When no entries are True and raise_if_empty=True, each getter should raise ValueError."""
-    monkeypatch.setattr(
-        main._country_resolver,
-        "get_concordance_dict",
-        lambda from_type, to_type: {"X": False},
-    )
+    df = pd.DataFrame({"dcid": ["X"], bool_field: [False]})
+    monkeypatch.setattr(main._country_resolver, "_concordance_table", df)
     with pytest.raises(ValueError) as exc:
         func(place_format="dcid", raise_if_empty=True)
     assert f"No places found for boolean field '{bool_field}'" in str(exc.value)
 
 
+def test_boolean_getter_returns_a_new_list_each_call(monkeypatch):
+    """Changing the returned list does not change the result of later calls."""
+    df = pd.DataFrame({"dcid": ["A", "B"], "sids": [True, True]})
+    monkeypatch.setattr(main._country_resolver, "_concordance_table", df)
+
+    first = main.get_sids()
+    first.append("Z")
+
+    assert main.get_sids() == ["A", "B"]
+
+
 def test_boolean_getter_invalid_format_raises():
     """Passing an invalid place_format raises before fetching anything."""
     with pytest.raises(ValueError):
@@ -265,7 +292,7 @@ def test_get_places_basic_filter(monkeypatch):
     result = main.get_places(
         filters={"region": "R1"}, place_format="name_official", raise_if_empty=False
     )
-    assert set(result) == {"A", "C"}
+    assert sorted(result) == ["A", "C"]
 
 
 def test_get_places_multiple_filters(monkeypatch):
@@ -285,7 +312,7 @@ def test_get_places_multiple_filters(monkeypatch):
         place_format="name_official",
         raise_if_empty=False,
     )
-    assert set(result) == {"A", "B", "E"}
+    assert sorted(result) == ["A", "B", "E"]
 
 
 def test_get_places_empty_warns_and_returns_empty(monkeypatch, caplog):
@@ -304,19 +331,41 @@ def test_get_places_empty_warns_and_returns_empty(monkeypatch, caplog):
     monkeypatch.setattr(main._country_resolver, "_concordance_table", df)
 
     caplog.set_level("WARNING", logger="bblocks.places.main")
+    filters = {"region": "R2", "income_level": "High"}
     result = main.get_places(
-        filters={"region": "R2", "income_level": "High"},
+        filters=filters,
         place_format="name_official",
         raise_if_empty=False,
     )
     assert result == []
-    # Values get coerced to lists in-place
+    # Values get coerced to sets, leaving the caller's filters unchanged
+    assert filters == {"region": "R2", "income_level": "High"}
     assert (
         "No places found for filters {'region': ['R2'], 'income_level': ['High']}"
         in caplog.text
     )
 
 
+def test_get_places_empty_message_sorts_values(monkeypatch, caplog):
+    """The values of each filter are listed in sorted order in the empty result message."""
+    df = pd.DataFrame(
+        {
+            "dcid": ["c1", "c2", "c3"],
+            "region": ["R1", "R2", "R3"],
+            "income_level": ["High", "Low", "Low"],
+        }
+    )
+    monkeypatch.setattr(main._country_resolver, "_concordance_table", df)
+
+    caplog.set_level("WARNING", logger="bblocks.places.main")
+    main.get_places(filters={"region": ["R3", "R2"], "income_level": "High"})
+
+    assert (
+        "No places found for filters {'region': ['R2', 'R3'], 'income_level': ['High']}"
+        in caplog.text
+    )
+
+
 def test_get_places_empty_raises(monkeypatch):
     """
     When filters are individually valid but yield no rows and raise_if_empty=True,
@@ -344,6 +393,28 @@ def test_get_places_empty_raises(monkeypatch):
     )
 
 
+def test_get_places_repeated_call_returns_new_list(monkeypatch):
+    """Repeated calls give the same places, unaffected by changes to earlier results."""
+    df = pd.DataFrame(
+        {
+            "dcid": ["c1", "c2", "c3"],
+            "name_official": ["A", "B", "C"],
+            "region": ["R1", "R2", "R1"],
+        }
+    )
+    monkeypatch.setattr(main._country_resolver, "_concordance_table", df)
+
+    first = main.get_places(filters={"region": "R1"}, place_format="name_official")
+    first.append("Z")
+
+    assert main.get_places(
+        filters={"region": ["R1"]}, place_format="name_official"
+    ) == [
+        "A",
+        "C",
+    ]
+
+
 def test_get_places_invalid_place_format():
     """get_places should reject invalid place_format before querying."""
     with pytest.raises(ValueError):
@@ -435,7 +506,7 @@ def test_main_filter_delegates(monkeypatch):
     assert result == ["A", "C"]
     assert captured == {
         "places": ["A", "B", "C"],
-        "filters": {"region": ["R1"]},
+        "filters": {"region": frozenset({"R1"})},
         "from_type": "name_official",
         "not_found": "ignore",
         "multiple_candidates": "last",
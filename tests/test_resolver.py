@@ -23,15 +23,27 @@ def test_handle_not_founds_raises_when_none_and_raise():
 def test_handle_not_founds_ignore_keeps_none():
     """Keeps None values when not_found='ignore'."""
     candidates = {"A": None, "B": "value"}
-    result = resolver.handle_not_founds(candidates.copy(), not_found="ignore")
+    result = resolver.handle_not_founds(candidates, not_found="ignore")
     assert result == {"A": None, "B": "value"}
 
 
 def test_handle_not_founds_replaces_none_with_custom_string():
     """Replaces None values with the provided not_found string."""
     candidates = {"A": None, "B": "value"}
-    result = resolver.handle_not_founds(candidates.copy(), not_found="MISSING")
+    result = resolver.handle_not_founds(candidates, not_found="MISSING")
     assert result == {"A": "MISSING", "B": "value"}
+    # the input is not modified
+    assert candidates == {"A": None, "B": "value"}
+
+
+def test_handle_not_founds_logs_single_warning(caplog):
+    """Logs one warning for all not found places, truncating long lists."""
+    candidates = {f"P{i}": None for i in range(7)}
+    caplog.set_level(logging.WARNING, logger="bblocks.places.config")
+    resolver.handle_not_founds(candidates, not_found="ignore")
+
+    assert len(caplog.records) == 1
+    assert "['P0', 'P1', 'P2', 'P3', 'P4'] and 2 more" in caplog.text
 
 
 # ----------------------------------------
@@ -50,17 +62,17 @@ def test_handle_multiple_candidates_first_picks_first():
     """Selects the first element when multiple_candidates='first'."""
     candidates = {"A": ["x", "y"], "B": ["u", "v"], "C": "only"}
     result = resolver.handle_multiple_candidates(
-        candidates.copy(), multiple_candidates="first"
+        candidates, multiple_candidates="first"
     )
     assert result == {"A": "x", "B": "u", "C": "only"}
+    # the input is not modified
+    assert candidates == {"A": ["x", "y"], "B": ["u", "v"], "C": "only"}
 
 
 def test_handle_multiple_candidates_last_picks_last():
     """Selects the last element when multiple_candidates='last'."""
     candidates = {"A": ["x", "y"], "B": ["u", "v"], "C": "only"}
-    result = resolver.handle_multiple_candidates(
-        candidates.copy(), multiple_candidates="last"
-    )
+    result = resolver.handle_multiple_candidates(candidates, multiple_candidates="last")
     assert result == {"A": "y", "B": "v", "C": "only"}
 
 
@@ -68,7 +80,7 @@ def test_handle_multiple_candidates_ignore_keeps_lists():
     """Keeps list values when multiple_candidates='ignore'."""
     candidates = {"A": ["x", "y"], "B": ["u"], "C": "only"}
     result = resolver.handle_multiple_candidates(
-        candidates.copy(), multiple_candidates="ignore"
+        candidates, multiple_candidates="ignore"
     )
     assert result == {"A": ["x", "y"], "B": ["u"], "C": "only"}
 
@@ -82,6 +94,15 @@ def test_handle_multiple_candidates_invalid_option_raises_value_error():
         )
 
 
+def test_handle_multiple_candidates_invalid_option_ignored_without_lists():
+    """An unsupported option is not checked when no place has multiple candidates."""
+    candidates = {"A": "single", "B": None}
+    result = resolver.handle_multiple_candidates(
+        candidates, multiple_candidates="unsupported"
+    )
+    assert result is candidates
+
+
 # ----------------------------------------
 # Tests for the read_default_concordance_table function
 # ----------------------------------------
@@ -95,6 +116,27 @@ def test_read_default_concordance_table_has_exact_columns():
     assert len(df.columns) == len(expected)
 
 
+def test_read_default_concordance_table_returns_independent_copies():
+    """The file is parsed once, and each call returns a table that can be modified freely."""
+    first = resolver.read_default_concordance_table()
+    first.loc[0, "iso3_code"] = "XXX"
+
+    second = resolver.read_default_concordance_table()
+    assert second is not first
+    assert second.loc[0, "iso3_code"] != "XXX"
+    assert resolver._parse_default_concordance_table.cache_info().currsize == 1
+
+
+def test_read_default_concordance_table_text_columns_are_strings():
+    """Low-cardinality text columns are strings, so new values can be set on the table."""
+    df = resolver.read_default_concordance_table()
+    for column in ["region", "subregion", "intermediate_region", "income_level"]:
+        assert df[column].dtype == "string"
+
+    df.loc[0, "region"] = "New"
+    assert df.loc[0, "region"] == "New"
+
+
 # ----------------------------------------
 # Tests for the PlaceResolver class
 # ----------------------------------------
@@ -114,6 +156,7 @@ def test_init_with_default_concordance_table(monkeypatch):
 
     # stub out the class‐level table and the validator
     monkeypatch.setattr(resolver.PlaceResolver, "_CONCORDANCE_TABLE", dummy_df)
+    monkeypatch.setattr(resolver.PlaceResolver, "_VALIDATED_DEFAULT_TABLE", None)
     monkeypatch.setattr(
         resolver,
         "validate_concordance_table",
@@ -127,6 +170,43 @@ def test_init_with_default_concordance_table(monkeypatch):
     assert called["validated"] is dummy_df
 
 
+def test_default_concordance_table_is_validated_once(monkeypatch):
+    """The shared default table is validated for the first resolver only."""
+    dummy_df = pd.DataFrame({"dcid": ["X"], "foo": ["bar"]})
+    validated = []
+
+    monkeypatch.setattr(resolver.PlaceResolver, "_CONCORDANCE_TABLE", dummy_df)
+    monkeypatch.setattr(resolver.PlaceResolver, "_VALIDATED_DEFAULT_TABLE", None)
+    monkeypatch.setattr(resolver, "validate_concordance_table", validated.append)
+
+    PlaceResolver(concordance_table="default")
+    PlaceResolver(concordance_table="default").set_concordance_table("default")
+    assert len(validated) == 1 and validated[0] is dummy_df
+
+    # custom tables are always validated
+    PlaceResolver(concordance_table=dummy_df)
+    assert len(validated) == 2
+
+
+def test_default_concordance_table_is_read_once(monkeypatch):
+    """The default concordance table is read on first use and shared by later instances."""
+    dummy_df = pd.DataFrame({"dcid": ["X"], "foo": ["bar"]})
+    reads = []
+
+    def fake_read():
+        reads.append(1)
+        return dummy_df
+
+    monkeypatch.setattr(resolver.PlaceResolver, "_CONCORDANCE_TABLE", None)
+    monkeypatch.setattr(resolver, "read_default_concordance_table", fake_read)
+
+    first = PlaceResolver(concordance_table="default")
+    second = PlaceResolver(concordance_table="default")
+
+    assert first._concordance_table is second._concordance_table is dummy_df
+    assert len(reads) == 1
+
+
 def test_init_with_invalid_concordance_string():
     """concordance_table=<bad string> should raise ValueError."""
     with pytest.raises(ValueError):
@@ -163,6 +243,51 @@ def test_init_with_dc_api_settings(monkeypatch):
     assert captured == settings
 
 
+def test_dc_client_is_created_on_first_use(monkeypatch):
+    """Resolving with the concordance table alone does not create a Data Commons client."""
+    created = []
+
+    class DummyDC:
+        def __init__(self, **kwargs):
+            created.append(kwargs)
+
+    monkeypatch.setattr(resolver, "DataCommonsClient", DummyDC)
+
+    df = pd.DataFrame({"dcid": ["c/1"], "name": ["Alpha"]})
+    pr = PlaceResolver(concordance_table=df)
+    assert pr.resolve_places("Alpha", from_type="name") == "c/1"
+    assert created == []
+
+    client = pr._dc_client
+    assert pr._dc_client is client
+    assert created == [{"dc_instance": "datacommons.one.org"}]
+
+
+# -------------------------------------------------
+# Tests for _map_candidates_to_dc_property method
+# -------------------------------------------------
+
+
+def test_map_candidates_to_dc_property_requests_unique_dcids(monkeypatch):
+    """Each dcid is requested once, and None candidates are not requested."""
+    requested = []
+
+    def fake_fetch_properties(dc_client, dcids, dc_property, cache=None):
+        requested.append(dcids)
+        return {"dc/1": "A", "dc/2": "B"}
+
+    monkeypatch.setattr(resolver, "fetch_properties", fake_fetch_properties)
+
+    pr = PlaceResolver(concordance_table=None)
+    candidates = {"x": "dc/1", "y": ["dc/1", "dc/2"], "z": None, "w": "dc/2"}
+    result = pr._map_candidates_to_dc_property(candidates, "prop")
+
+    assert requested == [["dc/1", "dc/2"]]
+    assert result == {"x": "A", "y": ["A", "B"], "z": None, "w": "B"}
+    # the candidates passed in are not modified
+    assert candidates == {"x": "dc/1", "y": ["dc/1", "dc/2"], "z": None, "w": "dc/2"}
+
+
 # -------------------------------------------------
 # Tests for from_concordance_csv method
 # -------------------------------------------------
@@ -197,6 +322,39 @@ def test_from_concordance_csv_reads_csv_and_sets_table(monkeypatch, tmp_path):
     assert pr._dc_entity_type == "Country"
 
 
+def test_from_concordance_csv_reads_selected_columns_with_dtypes(tmp_path):
+    """columns and dtype are used when parsing, and skipped columns are not read."""
+    csv_path = tmp_path / "test.csv"
+    csv_path.write_text("dcid,iso3_code,m49_code,notes\ncountry/ZWE,ZWE,716,x\n")
+
+    pr = PlaceResolver.from_concordance_csv(
+        csv_path,
+        columns=["dcid", "iso3_code", "m49_code"],
+        dtype=resolver.DEFAULT_CONCORDANCE_DTYPES,
+    )
+
+    assert pr.concordance_table.columns.tolist() == ["dcid", "iso3_code", "m49_code"]
+    assert pr.concordance_table["m49_code"].dtype == "Int64"
+    assert pr.concordance_table["iso3_code"].dtype == "string"
+
+
+def test_from_concordance_parquet_reads_parquet_and_sets_table(monkeypatch, tmp_path):
+    """from_concordance_parquet() should call pd.read_parquet on the given path and use that DataFrame."""
+    parquet_path = tmp_path / "table.parquet"
+    dummy_df = pd.DataFrame({"dcid": ["X"], "foo": ["bar"]})
+
+    def fake_read_parquet(path, *args, **kwargs):
+        assert str(path) == str(parquet_path)
+        return dummy_df
+
+    monkeypatch.setattr(resolver.pd, "read_parquet", fake_read_parquet)
+
+    pr = PlaceResolver.from_concordance_parquet(parquet_path, dc_entity_type="Country")
+
+    assert pr._concordance_table is dummy_df
+    assert pr._dc_entity_type == "Country"
+
+
 # -------------------------------------------------
 # Tests for the concordance_table property
 # -------------------------------------------------
@@ -211,6 +369,33 @@ def test_concordance_table_property_returns_df():
     assert pr.concordance_table is dummy
 
 
+def test_concordance_table_in_place_changes_need_set_concordance_table():
+    """In-place changes to the table are only used once the table is set again."""
+    table = pd.DataFrame(
+        {"dcid": ["c/1", "c/2"], "name": ["X", "Y"], "iso": ["x", "y"]}
+    )
+    pr = PlaceResolver(concordance_table=table)
+    assert pr.resolve_places(["X"], from_type="name", to_type="iso") == ["x"]
+
+    pr.concordance_table.loc[0, "iso"] = "zz"
+    assert pr.resolve_places(["X"], from_type="name", to_type="iso") == ["x"]
+    assert pr.get_concordance_dict("name", "iso") == {"X": "x", "Y": "y"}
+
+    pr.set_concordance_table(pr.concordance_table)
+    assert pr.resolve_places(["X"], from_type="name", to_type="iso") == ["zz"]
+    assert pr.get_concordance_dict("name", "iso") == {"X": "zz", "Y": "y"}
+
+
+def test_concordance_table_added_column_is_used():
+    """A column added to the table in place can be resolved to without setting the table again."""
+    table = pd.DataFrame({"dcid": ["c/1", "c/2"], "name": ["X", "Y"]})
+    pr = PlaceResolver(concordance_table=table)
+    assert pr.resolve_places(["X"], from_type="name", to_type="dcid") == ["c/1"]
+
+    pr.concordance_table["code"] = ["a", "b"]
+    assert pr.resolve_places(["X"], from_type="name", to_type="code") == ["a"]
+
+
 def test_concordance_table_property_raises_when_none():
     """Raises ValueError if no concordance table is defined."""
     pr = PlaceResolver(concordance_table=None)
@@ -219,6 +404,49 @@ def test_concordance_table_property_raises_when_none():
         _ = pr.concordance_table
 
 
+# -------------------------------------------------
+# Tests for set_concordance_table method
+# -------------------------------------------------
+
+
+def test_set_concordance_table_replaces_table_and_lookups():
+    """Replacing the table returns self and maps places with the new table."""
+    old = pd.DataFrame({"dcid": ["country/ZWE"], "iso3_code": ["ZWE"]})
+    new = pd.DataFrame({"dcid": ["country/ZWE"], "iso3_code": ["ZIM"]})
+    pr = PlaceResolver(concordance_table=old)
+    assert pr._get_mapper("dcid", "iso3_code") == {"countryzwe": "ZWE"}
+
+    returned = pr.set_concordance_table(new)
+
+    assert returned is pr
+    assert pr.concordance_table is new
+    assert pr._get_mapper("dcid", "iso3_code") == {"countryzwe": "ZIM"}
+
+
+def test_set_concordance_table_default_and_none():
+    """'default' sets the shared default table and None removes the table."""
+    pr = PlaceResolver(concordance_table=None)
+
+    pr.set_concordance_table("default")
+    assert pr.concordance_table is PlaceResolver._default_concordance_table()
+
+    pr.set_concordance_table(None)
+    assert pr._concordance_table is None
+
+
+def test_set_concordance_table_invalid_keeps_current_table():
+    """An invalid table raises ValueError and the current table is kept."""
+    table = pd.DataFrame({"dcid": ["country/ZWE"], "iso3_code": ["ZWE"]})
+    pr = PlaceResolver(concordance_table=table)
+
+    with pytest.raises(ValueError):
+        pr.set_concordance_table(pd.DataFrame({"iso3_code": ["ZWE"]}))
+    with pytest.raises(ValueError):
+        pr.set_concordance_table("custom")
+
+    assert pr.concordance_table is table
+
+
 # -------------------------------------------------
 # Tests for add_custom_disambiguation method
 # -------------------------------------------------
@@ -240,7 +468,7 @@ def test_add_custom_disambiguation_sets_new_dict():
 def test_add_custom_disambiguation_updates_existing_dict():
     """Merges new rules into existing _custom_disambiguation and returns self."""
     initial = {"A": "dc/A"}
-    pr = PlaceResolver(concordance_table=None, custom_disambiguation=initial.copy())
+    pr = PlaceResolver(concordance_table=None, custom_disambiguation=initial)
 
     new_rules = {"B": "dc/B"}
     returned = pr.add_custom_disambiguation(new_rules)
@@ -248,6 +476,21 @@ def test_add_custom_disambiguation_updates_existing_dict():
     assert returned is pr
     # Original entry plus the new one
     assert pr._custom_disambiguation == {"A": "dc/A", "B": "dc/B"}
+    # the caller's dictionary is not modified
+    assert initial == {"A": "dc/A"}
+
+
+def test_add_custom_disambiguation_keeps_default_rules_unchanged():
+    """Adding rules to a resolver using the default rules doesn't change them for other resolvers."""
+    default_rules = dict(PlaceResolver._EDGE_CASES)
+    pr = PlaceResolver(concordance_table=None, custom_disambiguation="default")
+
+    pr.add_custom_disambiguation({"atlantis": "dc/ATL"})
+
+    assert pr._custom_disambiguation["atlantis"] == "dc/ATL"
+    assert PlaceResolver._EDGE_CASES == default_rules
+    other = PlaceResolver(concordance_table=None, custom_disambiguation="default")
+    assert "atlantis" not in other._custom_disambiguation
 
 
 # -------------------------------------------------
@@ -271,6 +514,27 @@ def test_resolve_map_basic_concordance_mapping():
     assert result == {"Alpha": "RegA", "Beta": "RegB"}
 
 
+def test_resolve_map_reuses_mappers_until_table_changes():
+    """Concordance mappers are built once per table and type pair, and rebuilt for a new table."""
+    df = pd.DataFrame({"dcid": ["dc/1"], "name": ["Alpha"], "region": ["RegA"]})
+    pr = PlaceResolver(concordance_table=df)
+    mapper = pr._get_mapper("name", "dcid")
+
+    # later calls reuse the mapper
+    assert pr._get_mapper("name", "dcid") is mapper
+
+    # setting the table again rebuilds the mappers from its current contents
+    other = PlaceResolver(concordance_table=df)._get_mapper("name", "dcid")
+    assert other is not mapper and other == mapper
+
+    pr._concordance_table = pd.DataFrame(
+        {"dcid": ["dc/1"], "name": ["Alpha"], "region": ["RegZ"]}
+    )
+    result = pr.map_places(["Alpha"], from_type="name", to_type="region")
+    assert result == {"Alpha": "RegZ"}
+    assert pr._get_mapper("name", "dcid") is not mapper
+
+
 def test_resolve_map_not_found_ignore_returns_none():
     """When a place isn’t in the concordance and not_found='ignore', it yields None."""
     df = pd.DataFrame({"dcid": ["dc/1"], "name": ["Alpha"], "region": ["RegA"]})
@@ -348,6 +612,93 @@ def test_resolve_series_preserves_index_and_type():
     assert list(series_out.values) == ["RegA", None]
 
 
+def test_resolve_series_resolves_unique_places_once(monkeypatch):
+    """Series input resolves each unique non-null place once and keeps nulls in place."""
+    df = pd.DataFrame({"dcid": ["c/1"], "name": ["Alpha"], "region": ["RegA"]})
+    pr = PlaceResolver(concordance_table=df)
+    calls = []
+    original_resolve = pr._resolve
+
+    def recording_resolve(places, **kwargs):
+        calls.append(places)
+        return original_resolve(places, **kwargs)
+
+    monkeypatch.setattr(pr, "_resolve", recording_resolve)
+
+    series_in = pd.Series(["Alpha", None, "Alpha"], index=[5, 6, 7])
+    series_out = pr.resolve_places(series_in, from_type="name", to_type="region")
+
+    assert calls == [["Alpha"]]
+    assert series_out.tolist() == ["RegA", None, "RegA"]
+    assert list(series_out.index) == [5, 6, 7]
+
+    with pytest.raises(ValueError):
+        pr.resolve_places(series_in, from_type="name", ignore_nulls=False)
+
+
+def test_resolve_list_keeps_value_types():
+    """List results keep integers and None, rather than being converted to floats and nan."""
+    df = pd.DataFrame(
+        {
+            "dcid": ["dc/1", "dc/2", "dc/3"],
+            "name": ["A", "B", "C"],
+            "num": pd.array([4, 5, None], dtype="Int64"),
+        }
+    )
+    pr = PlaceResolver(concordance_table=df)
+
+    for places, expected in [
+        (["A", "Z"], [4, None]),
+        (["A", "C"], [4, None]),
+        (["A", None], [4, None]),
+    ]:
+        result = pr.resolve_places(
+            places, from_type="name", to_type="num", not_found="ignore"
+        )
+        assert result == expected
+        assert type(result[0]) is int and result[1] is None
+
+
+def test_resolve_categorical_series():
+    """Categorical Series input is resolved per category and keeps its index and nulls."""
+    df = pd.DataFrame(
+        {"dcid": ["c/1", "c/2"], "name": ["Alpha", "Beta"], "region": ["RegA", "RegB"]}
+    )
+    pr = PlaceResolver(concordance_table=df)
+
+    series_in = pd.Series(
+        ["Beta", None, "Alpha", "Beta"], dtype="category", index=list("wxyz")
+    )
+    series_out = pr.resolve_places(series_in, from_type="name", to_type="region")
+
+    assert list(series_out.index) == ["w", "x", "y", "z"]
+    assert series_out[["w", "y", "z"]].tolist() == ["RegB", "RegA", "RegB"]
+    assert pd.isna(series_out["x"])
+
+
+def test_resolve_list_resolves_unique_places_once(monkeypatch):
+    """List input resolves each unique non-null place once and returns a list in the same order."""
+    df = pd.DataFrame(
+        {"dcid": ["c/1", "c/2"], "name": ["Alpha", "Beta"], "region": ["RegA", "RegB"]}
+    )
+    pr = PlaceResolver(concordance_table=df)
+    calls = []
+    original_resolve = pr._resolve
+
+    def recording_resolve(places, **kwargs):
+        calls.append(places)
+        return original_resolve(places, **kwargs)
+
+    monkeypatch.setattr(pr, "_resolve", recording_resolve)
+
+    result = pr.resolve_places(
+        ["Beta", None, "Alpha", "Beta"], from_type="name", to_type="region"
+    )
+
+    assert calls == [["Beta", "Alpha"]]
+    assert result == ["RegB", None, "RegA", "RegB"]
+
+
 def test_resolve_missing_raises_and_ignore_nulls_bypasses():
     """not_found='raise' triggers PlaceNotFoundError; ignore_nulls=True with not_found='ignore' yields None."""
     df = pd.DataFrame({"dcid": ["c/1"], "name": ["Alpha"], "region": ["RegA"]})
@@ -433,6 +784,25 @@ def test_filter_list_multiple_criteria():
     assert result == ["C"]
 
 
+def test_filter_boolean_category_skips_unresolved_places():
+    """Boolean filters match on the flag, and places that could not be resolved are dropped."""
+    df = pd.DataFrame(
+        {
+            "dcid": ["c1", "c2", "c3"],
+            "name": ["A", "B", "C"],
+            "member": [True, False, True],
+        }
+    )
+    pr = PlaceResolver(concordance_table=df)
+    result = pr.filter_places(
+        ["C", "X", "A", "B", "C"],
+        filters={"member": True},
+        from_type="name",
+        not_found="ignore",
+    )
+    assert result == ["C", "A", "C"]
+
+
 def test_filter_series_returns_series_of_matching_values():
     """Filtering a pandas Series returns a new Series containing only matching entries."""
     df = pd.DataFrame(
@@ -458,6 +828,22 @@ def test_filter_invalid_places_type_raises():
         pr.filter_places(("A", "B"), filters={"region": "R1"}, from_type="name")
 
 
+def test_filter_without_filters_keeps_unresolved_places():
+    """With no filters, every place is kept, including places that were not resolved."""
+    df = pd.DataFrame({"dcid": ["dc/1"], "name": ["Alpha"], "region": ["RegA"]})
+    pr = PlaceResolver(concordance_table=df)
+
+    result = pr.filter_places(
+        ["Alpha", "Gamma", "Alpha"], filters={}, from_type="name", not_found="ignore"
+    )
+    assert result == ["Alpha", "Gamma", "Alpha"]
+
+    series = pr.filter_places(
+        pd.Series(["Gamma", "Alpha"]), filters={}, from_type="name", not_found="ignore"
+    )
+    assert series.tolist() == ["Gamma", "Alpha"]
+
+
 def test_filter_unknown_category_raises_keyerror():
     """Filtering by a category not in concordance table raises KeyError."""
     df = pd.DataFrame({"dcid": ["c1"], "name": ["A"], "region": ["R1"]})
@@ -505,6 +891,23 @@ def test_get_concordance_dict_same_column_logs_warning_and_identity(caplog):
     assert any("from_type and to_type are the same" in msg for msg in logs)
 
 
+def test_get_concordance_dict_is_built_once_and_returns_copies():
+    """The dictionary is built once per table and type pair, and each call gets its own copy."""
+    df = pd.DataFrame({"dcid": ["c1", "c2"], "name": ["A", "B"]})
+    pr = PlaceResolver(concordance_table=df)
+
+    first = pr.get_concordance_dict("name", "dcid")
+    first["Z"] = "changed"
+    second = pr.get_concordance_dict("name", "dcid")
+
+    assert second == {"A": "c1", "B": "c2"}
+    assert second is not first
+
+    # a new table gets a new dictionary
+    pr._concordance_table = pd.DataFrame({"dcid": ["c3"], "name": ["C"]})
+    assert pr.get_concordance_dict("name", "dcid") == {"C": "c3"}
+
+
 def test_get_concordance_dict_drops_nulls_by_default():
     """By default (include_nulls=False), entries with null target values are removed."""
     df = pd.DataFrame(
@@ -718,3 +1121,38 @@ def test_resolve_map_custom_mapping_prevents_not_found_raise():
     )
     # "A" comes from the table, "B" from custom_mapping, no error
     assert result == {"A": "R1", "B": "CustomVal"}
+
+
+def test_resolve_map_custom_mapping_covering_all_places_skips_resolution(monkeypatch):
+    """If custom_mapping covers every place, no resolution is run and a copy is returned."""
+    pr = PlaceResolver(concordance_table=None)
+    monkeypatch.setattr(
+        pr,
+        "_resolve_with_disambiguation",
+        lambda **kwargs: pytest.fail("places should not be resolved"),
+    )
+
+    custom = {"A": "X", "B": "Y"}
+    result = pr.map_places(["B", "A"], custom_mapping=custom)
+
+    assert result == custom
+    assert result is not custom
+
+
+def test_resolve_list_with_duplicates_keeps_input_order():
+    """Duplicated list input is resolved once per place, with keys and results in input order."""
+    df = pd.DataFrame(
+        {
+            "dcid": ["d1", "d2", "d3"],
+            "name": ["A", "B", "C"],
+            "region": ["R1", "R2", "R3"],
+        }
+    )
+    pr = PlaceResolver(concordance_table=df)
+    places = ["C", "A", "C", "B", "A"]
+
+    mapping = pr.map_places(places, from_type="name", to_type="region")
+    assert list(mapping) == ["C", "A", "B"]
+
+    result = pr.resolve_places(places, from_type="name", to_type="region")
+    assert result == ["R3", "R1", "R3", "R2", "R1"]
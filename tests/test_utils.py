@@ -1,29 +1,30 @@
 """Tests for the utils module"""
 
 import pytest
+import pandas as pd
 
 from bblocks.places import utils
 
 
-@pytest.mark.parametrize(
-    "input_str, expected",
-    [
-        ("Côte d'Ivoire", "cotedivoire"),
-        ("São Tomé and Príncipe", "saotomeandprincipe"),
-        ("  Hello World  ", "helloworld"),
-        ("\nNew\nLine\tTab ", "newlinetab"),
-        ("École", "ecole"),
-        ("naïve café", "naivecafe"),
-        ("Ångström", "angstrom"),
-        ("", ""),  # Empty string
-        ("    ", ""),  # Only spaces
-        ("12345", "12345"),  # Numbers should stay
-        (None, None),  # None input should return None
-        (4, "4"),  # Integer input
-        (625, "625"),  # Larger integer input
-        (3.14, "314"),  # Float input (dot is punctuation, removed)
-    ],
-)
+_SIMPLE_CASES = [
+    ("Côte d'Ivoire", "cotedivoire"),
+    ("São Tomé and Príncipe", "saotomeandprincipe"),
+    ("  Hello World  ", "helloworld"),
+    ("\nNew\nLine\tTab ", "newlinetab"),
+    ("École", "ecole"),
+    ("naïve café", "naivecafe"),
+    ("Ångström", "angstrom"),
+    ("", ""),  # Empty string
+    ("    ", ""),  # Only spaces
+    ("12345", "12345"),  # Numbers should stay
+    (None, None),  # None input should return None
+    (4, "4"),  # Integer input
+    (625, "625"),  # Larger integer input
+    (3.14, "314"),  # Float input (dot is punctuation, removed)
+]
+
+
+@pytest.mark.parametrize("input_str, expected", _SIMPLE_CASES)
 def test_simple_clean_string(input_str, expected):
     """Test the clean_string function with various inputs."""
 
@@ -37,6 +38,11 @@ def test_simple_clean_string(input_str, expected):
         ("漢字", "漢字"),
         # Combining marks only get stripped out entirely
         ("\u0301\u0300", ""),
+        # Combining marks after a base letter are stripped, however many there are
+        ("e\u0301cole", "ecole"),
+        ("Cafe\u0327\u0301\u0300", "cafe"),
+        # Combining marks from outside the Latin diacritics block
+        ("\u0915\u093c", "\u0915"),
     ],
 )
 def test_clean_string_non_latin_and_combining(input_str, expected):
@@ -58,6 +64,91 @@ def test_clean_string_various_punctuation(input_str, expected):
     assert utils.clean_string(input_str) == expected
 
 
+@pytest.mark.parametrize(
+    "input_str, expected",
+    [
+        ("ﬁji", "fiji"),  # ligature decomposes to ASCII
+        ("Ｉｔａｌｙ", "italy"),  # full-width letters decompose to ASCII
+        ("Åland Islands", "alandislands"),  # accents are stripped
+    ],
+)
+def test_clean_string_compatibility_characters(input_str, expected):
+    """Test the clean_string function with characters that decompose to ASCII."""
+    assert utils.clean_string(input_str) == expected
+
+
+@pytest.mark.parametrize("input_str", ["Ærø", "İstanbul", "Đakovo", "ǅemal", "Straße"])
+def test_clean_string_folds_latin_as_normalisation_does(input_str):
+    """Strings folded with the Latin table are cleaned the same as strings that are normalised."""
+    # a character above the fold table makes clean_string normalise the whole string
+    assert utils.clean_string(input_str + "漢") == utils.clean_string(input_str) + "漢"
+
+
+def test_clean_string_fold_table_matches_normalisation():
+    """Every character in the fold table cleans the same way as it does when normalised."""
+    for c in range(ord(utils._FOLD_LIMIT)):
+        assert utils.clean_string(chr(c) + "漢") == utils.clean_string(chr(c)) + "漢"
+
+
+def test_clean_string_reuses_cached_results():
+    """Test that repeated values are cleaned once, and values converting to the same string share a result."""
+    utils._clean_str.cache_clear()
+
+    assert utils.clean_string("Seychelles") == "seychelles"
+    assert utils.clean_string("Seychelles") == "seychelles"
+    assert utils.clean_string(4) == utils.clean_string("4") == "4"
+
+    info = utils._clean_str.cache_info()
+    assert (info.hits, info.misses) == (2, 2)
+
+
+def test_clean_series_matches_clean_string():
+    """Test that clean_series cleans every value like clean_string and keeps nulls."""
+    values = ["Côte d'Ivoire", "  Hello World  ", "co-operation", "漢字", 625, 3.14]
+    series = pd.Series(values + [None], index=range(10, 17))
+
+    result = utils.clean_series(series)
+
+    assert result.index.equals(series.index)
+    assert result.tolist()[:-1] == [utils.clean_string(v) for v in values]
+    assert result.iloc[-1] is None
+
+
+def test_clean_series_bulk_matches_expected():
+    """Test that clean_series cleans a large Series of repeated values as expected."""
+    inputs, expected = zip(*_SIMPLE_CASES * 1000)
+
+    result = utils.clean_series(pd.Series(inputs, dtype=object))
+
+    assert result.tolist() == list(expected)
+
+
+def test_clean_series_categorical_input():
+    """Test that clean_series cleans categorical and repeated values like clean_string."""
+    series = pd.Series(
+        ["High income", "Low income", None, "High income"], dtype="category"
+    )
+
+    result = utils.clean_series(series)
+
+    assert result.tolist()[:2] == ["highincome", "lowincome"]
+    assert pd.isna(result.iloc[2])
+    assert result.iloc[3] == "highincome"
+
+
+@pytest.mark.parametrize(
+    "values, expected",
+    [
+        ([], "[]"),
+        (["a", "b"], "['a', 'b']"),
+        (list(range(7)), "[0, 1, 2, 3, 4] and 2 more"),
+    ],
+)
+def test_format_values(values, expected):
+    """Test that format_values truncates long lists."""
+    assert utils.format_values(values) == expected
+
+
 @pytest.mark.parametrize(
     "lst, chunk_size, expected",
     [
@@ -76,11 +167,17 @@ def test_split_list_various(lst, chunk_size, expected):
 def test_split_list_zero_chunk_size():
     """Test that split_list raises ValueError for zero chunk size."""
     with pytest.raises(ValueError):
-        # range(step=0) should trigger ValueError
         list(utils.split_list([1, 2, 3], 0))
 
 
 def test_split_list_negative_chunk_size():
     """Test that split_list returns an empty list for negative chunk size."""
-    # negative step yields no iterations
     assert list(utils.split_list([1, 2, 3], -1)) == []
+
+
+@pytest.mark.parametrize("max_workers", [None, 1, 4])
+def test_map_concurrently_keeps_order(max_workers):
+    """Test that map_concurrently returns results in the order of the items."""
+    assert utils.map_concurrently(lambda x: x * 2, range(10), max_workers) == [
+        x * 2 for x in range(10)
+    ]